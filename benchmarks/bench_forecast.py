@@ -0,0 +1,66 @@
+"""Backtest rolling-origin model prakiraan permintaan per jam (bikeshare.forecast).
+
+Setiap fold melatih model pada semua jam sebelum titik awal lalu
+memprakirakan horizon berikutnya; fold terakhir berakhir di akhir data.
+Akurasi (MAE, RMSE, RMSLE untuk casual, registered, cnt) dibandingkan dengan
+pembanding naif rata-rata per (workingday, hr), ditambah MAE cnt per
+weathersit/season, waktu pelatihan, prediksi batch per detik dan latensi
+score() satu jam. Hasilnya berupa JSON; angka akurasi sama untuk data dan
+parameter yang sama.
+
+    python benchmarks/bench_forecast.py --folds 6 --horizon-days 30 --output forecast.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bikeshare.forecast import backtest  # noqa: E402
+from bikeshare.ingest import load_frames  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--folds', type=int, default=6)
+    parser.add_argument('--horizon-days', type=int, default=30)
+    parser.add_argument('--output', help='file JSON hasil (default: stdout)')
+    args = parser.parse_args()
+
+    _, hour_data = load_frames()
+    report = {
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'sklearn': sklearn.__version__,
+        },
+        'backtest': backtest(hour_data, folds=args.folds, horizon_days=args.horizon_days),
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    summary = report['backtest']
+    for name in ('model', 'naive'):
+        cnt = summary['overall'][name]['cnt']
+        print(f"{name:>6} cnt: MAE {cnt['mae']:.1f}  RMSE {cnt['rmse']:.1f}  RMSLE {cnt['rmsle']:.3f}", file=sys.stderr)
+    throughput = summary['throughput']
+    print(f"batch {throughput['batch_predictions_per_second']:,.0f} jam/detik, "
+          f"score() p50 {throughput['score_latency_ms_p50']:.2f} ms", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Membandingkan pelabelan per baris (Series.apply) dengan bikeshare.features.
+
+Dataset hour.csv direplikasi hingga jumlah baris yang diminta, lalu kedua cara
+diukur dan hasilnya dipastikan sama.
+
+    python benchmarks/bench_labels.py --rows 10000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bikeshare.features import time_of_day, weather_category, weekend_as_holiday  # noqa: E402
+from bikeshare.store import load_frames  # noqa: E402
+
+
+def time_of_day_apply(hour):
+    if 6 <= hour < 12:
+        return 'Pagi'
+    elif 12 <= hour < 18:
+        return 'Siang'
+    elif 18 <= hour < 20:
+        return 'Sore'
+    else:
+        return 'Malam'
+
+
+def weather_of_day_apply(weathersit):
+    if weathersit == 1:
+        return 'Cerah/Sedikit berawan'
+    elif weathersit == 2:
+        return 'Berawan/Berkabut'
+    elif weathersit == 3:
+        return 'Hujan Salju/Badai'
+    elif weathersit == 4:
+        return 'Cuaca Ekstrim'
+    else:
+        return 'Tidak Valid'
+
+
+def replicate(frame, rows):
+    repeats = -(-rows // len(frame))
+    index = np.tile(np.arange(len(frame)), repeats)[:rows]
+    return frame.iloc[index].reset_index(drop=True)
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    day_data, hour_data = load_frames()
+    hours = replicate(hour_data, args.rows)
+    days = replicate(day_data, args.rows)
+
+    cases = [
+        ('rentang_waktu',
+         lambda: hours['hr'].apply(time_of_day_apply),
+         lambda: time_of_day(hours['hr'])),
+        ('weather_category',
+         lambda: hours['weathersit'].apply(weather_of_day_apply),
+         lambda: weather_category(hours['weathersit'])),
+        ('holiday (akhir pekan)',
+         lambda: days.apply(lambda row: 1 if row['weekday'] in [5, 6] else row['holiday'], axis=1),
+         lambda: weekend_as_holiday(days)),
+    ]
+
+    print(f'{args.rows:,} baris')
+    for name, slow, fast in cases:
+        expected, slow_seconds = timed(slow)
+        result, fast_seconds = timed(fast)
+        assert (np.asarray(expected).astype(str) == np.asarray(result).astype(str)).all(), name
+        print(f'{name:<22} apply {slow_seconds:8.3f}s  vektor {fast_seconds:8.3f}s  '
+              f'({slow_seconds / fast_seconds:,.0f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+"""Mengukur tahap-tahap komputasi dashboard pada data sintetis berskala 1x, 100x dan 1000x.
+
+Data sintetis dibangkitkan dengan bikeshare.synthetic (skema sama dengan
+hour.csv/day.csv, dikalibrasi dari data asli). Setiap tahap (load, pembersihan
+z-score, groupby, KMeans, korelasi, dekomposisi musiman, render grafik)
+dijalankan tanpa browser dan diukur waktunya, lalu dijalankan sekali lagi di
+bawah tracemalloc untuk puncak memorinya. Hasilnya berupa JSON; dengan
+--baseline, tahap yang melambat melebihi --tolerance dilaporkan dan skrip
+keluar dengan kode 1.
+
+    python benchmarks/bench_scale.py --scales 1 100 1000 --output bench.json
+    python benchmarks/bench_scale.py --scales 1 100 --baseline bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import seaborn as sns  # noqa: E402
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bikeshare.charts import downsample, figure_png  # noqa: E402
+from bikeshare.correlation import correlation_sketch  # noqa: E402
+from bikeshare.cube import build_cube, rollup  # noqa: E402
+from bikeshare.decomposition import (  # noqa: E402
+    DAY_PERIODS, HOUR_PERIODS, daily_series, decompose, hourly_series)
+from bikeshare.features import add_labels  # noqa: E402
+from bikeshare.outliers import outlier_mask  # noqa: E402
+from bikeshare.segmentation import assign_segments, fit_segments  # noqa: E402
+from bikeshare.store import load_frames, open_table, write_table  # noqa: E402
+from bikeshare.synthetic import synthetic_frames  # noqa: E402
+
+DEFAULT_SCALES = (1, 100, 1000)
+MB = 1024 * 1024
+
+# Selisih waktu di bawah ini dianggap derau pengukuran, bukan regresi
+MIN_REGRESSION_SECONDS = 0.05
+
+
+def stage_store(state):
+    write_table('day', state['day_data'], state['cache_dir'])
+    write_table('hour', state['hour_data'], state['cache_dir'])
+
+
+def stage_load(state):
+    state['day_data'] = open_table('day', state['cache_dir'])
+    state['hour_data'] = add_labels(open_table('hour', state['cache_dir']))
+
+
+def stage_zscore(state):
+    hour_data = state['hour_data']
+    state['cleaned'] = hour_data[outlier_mask(hour_data, 'cnt', threshold=3)]
+
+
+def stage_groupby(state):
+    hour_data, day_data = state['hour_data'], state['day_data']
+    hour_cube = build_cube(hour_data)
+    build_cube(state['cleaned'])
+    state['monthly'] = rollup(hour_cube, ['yr', 'mnth'], ['cnt']).reset_index()
+    state['season'] = rollup(hour_cube, ['season'], stat='mean')
+    hour_data.groupby('rentang_waktu', observed=True)['cnt'].sum()
+    state['weather'] = hour_data.groupby('weather_category', observed=True)['cnt'].sum()
+    day_data.groupby('windspeed')['cnt'].sum()
+
+
+def stage_kmeans(state):
+    cluster_data = state['cleaned'][['hr', 'weathersit', 'cnt']]
+    model = fit_segments(cluster_data, n_clusters=3)
+    points = downsample(cluster_data)
+    state['segments'] = points.assign(cluster=assign_segments(model, points))
+
+
+def stage_corr(state):
+    # Jalur dashboard: sketch kovarians dan peringkat atas baris bersih, bukan .corr()
+    state['correlation'] = correlation_sketch(state['cleaned']).correlation()
+
+
+def stage_decomposition(state):
+    # Banyak stasiun per tanggal: deret dijumlahkan dulu seperti total jaringan
+    day_total = state['day_data'].groupby('dteday', as_index=False)['cnt'].sum()
+    decompose(daily_series(day_total), DAY_PERIODS)
+    if state['hourly_decomposition']:
+        hour_total = state['hour_data'].groupby(['dteday', 'hr'], as_index=False)['cnt'].sum()
+        decompose(hourly_series(hour_total), HOUR_PERIODS)
+
+
+def stage_render(state):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    for yr, group in state['monthly'].groupby('yr'):
+        ax.plot(group['mnth'], group['cnt'], marker='o', label=str(yr))
+    figure_png(fig)
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(x=state['weather'].index.astype(str), y=state['weather'].to_numpy(), ax=ax)
+    figure_png(fig)
+
+    fig, ax = plt.subplots(figsize=(8, 6))
+    sns.heatmap(state['correlation'], annot=True, cmap='coolwarm', ax=ax)
+    figure_png(fig)
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.scatterplot(data=state['segments'], x='hr', y='cnt', hue='cluster', palette='viridis', ax=ax)
+    figure_png(fig)
+    plt.close('all')
+
+
+STAGES = (
+    ('store', stage_store),
+    ('load', stage_load),
+    ('zscore', stage_zscore),
+    ('groupby', stage_groupby),
+    ('kmeans', stage_kmeans),
+    ('corr', stage_corr),
+    ('decomposition', stage_decomposition),
+    ('render', stage_render),
+)
+
+
+def max_rss_mb():
+    # ru_maxrss dalam KiB di Linux, dalam byte di macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / MB if sys.platform == 'darwin' else rss / 1024
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def traced_peak_mb(func, *args):
+    """Puncak alokasi (MB) selama func berjalan, diukur dengan tracemalloc.
+
+    tracemalloc memperlambat kode yang banyak alokasi objek Python (misalnya
+    render matplotlib) beberapa kali lipat, jadi dijalankan terpisah dari
+    pengukuran waktu.
+    """
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1] / MB
+    finally:
+        tracemalloc.stop()
+
+
+def run_scale(hour_source, scale, seed, hourly_decomposition, memory=True):
+    with tempfile.TemporaryDirectory(prefix='bikeshare-bench-') as cache_dir:
+        (day_data, hour_data), seconds = timed(synthetic_frames, hour_source, scale, seed)
+        report = {
+            'scale': scale,
+            'hour_rows': len(hour_data),
+            'day_rows': len(day_data),
+            'generate_seconds': seconds,
+            'stages': {},
+        }
+        state = {'day_data': day_data, 'hour_data': hour_data, 'cache_dir': cache_dir,
+                 'hourly_decomposition': hourly_decomposition}
+        del day_data, hour_data
+        for name, stage in STAGES:
+            _, seconds = timed(stage, state)
+            peak = traced_peak_mb(stage, state) if memory else None
+            report['stages'][name] = {'seconds': seconds, 'peak_mb': peak}
+            print(f'  {scale:>5}x {name:<14} {seconds:9.3f}s '
+                  f'{"" if peak is None else f"{peak:10.1f} MB"}', file=sys.stderr)
+        state.clear()
+    report['max_rss_mb'] = max_rss_mb()
+    return report
+
+
+def regressions(report, baseline, tolerance):
+    """Daftar (skala, tahap, detik_baseline, detik_sekarang) yang melambat melebihi toleransi."""
+    previous = {entry['scale']: entry['stages'] for entry in baseline['results']}
+    slower = []
+    for entry in report['results']:
+        for name, stage in entry['stages'].items():
+            before = previous.get(entry['scale'], {}).get(name)
+            if (before and stage['seconds'] > before['seconds'] * tolerance
+                    and stage['seconds'] - before['seconds'] > MIN_REGRESSION_SECONDS):
+                slower.append((entry['scale'], name, before['seconds'], stage['seconds']))
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=list(DEFAULT_SCALES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--skip-hourly-decomposition', action='store_true',
+                        help='lewati MSTL per jam (biayanya tidak bergantung pada skala)')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='lewati pengukuran puncak memori (tiap tahap hanya dijalankan sekali)')
+    parser.add_argument('--output', help='file JSON hasil (default: stdout)')
+    parser.add_argument('--baseline', help='JSON hasil sebelumnya untuk dibandingkan')
+    parser.add_argument('--tolerance', type=float, default=1.25)
+    args = parser.parse_args()
+
+    _, hour_source = load_frames()
+    hour_source = hour_source.copy()
+
+    report = {
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+        },
+        'seed': args.seed,
+        'results': [run_scale(hour_source, scale, args.seed, not args.skip_hourly_decomposition,
+                              memory=not args.no_memory)
+                    for scale in args.scales],
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            slower = regressions(report, json.load(f), args.tolerance)
+        for scale, name, before, after in slower:
+            print(f'REGRESI {scale}x {name}: {before:.3f}s -> {after:.3f}s', file=sys.stderr)
+        if slower:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
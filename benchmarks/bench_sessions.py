@@ -0,0 +1,147 @@
+"""Uji beban dashboard dengan banyak sesi sekaligus dalam satu proses server.
+
+Setiap sesi (streamlit.testing AppTest di thread sendiri) menjalankan skrip
+dashboard sekali lalu mengganti filter tahun, sama seperti pengguna yang
+membuka halaman lalu memfilter. Semua sesi memakai SHARED_CACHE yang sama,
+jadi yang diukur adalah latensi per sesi, pertumbuhan RSS per sesi
+tambahan, statistik cache bersama (hit/miss/pengusiran) dan isi
+st.session_state (seharusnya hanya pilihan filter). Hasilnya berupa JSON.
+
+AppTest tidak mengenal halaman lain, jadi baris st.sidebar.page_link
+dihapus dari salinan skrip yang dijalankan.
+
+    python benchmarks/bench_sessions.py --sessions 8 --budget-mb 512 --output sessions.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bikeshare.shared import SHARED_CACHE  # noqa: E402
+
+SCRIPT = os.path.join(ROOT, 'uas_streamlit.py')
+PAGE_LINK = 'st.sidebar.page_link("uas_streamlit.py", label="Dashboard")'
+
+# Kunci session_state yang boleh ada: hanya pilihan filter/widget
+FILTER_KEYS = {'selected_years', 'correlation_method', 'distribution_column'}
+
+
+def _rss_mb():
+    # RSS saat ini dari /proc (Linux); di sistem lain memakai puncak RSS
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except OSError:
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def run_session(source, timeout, result):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_string(source, default_timeout=timeout)
+    start = time.perf_counter()
+    app.run()
+    result['first_run'] = time.perf_counter() - start
+    result['exceptions'] = [item.value for item in app.exception]
+
+    start = time.perf_counter()
+    app.multiselect(key='selected_years').set_value([2011]).run()
+    result['filter_run'] = time.perf_counter() - start
+    result['exceptions'] += [item.value for item in app.exception]
+    result['session_state'] = sorted(app.session_state.keys())
+
+
+def run_wave(source, sessions, timeout):
+    """Menjalankan `sessions` sesi bersamaan; mengembalikan hasil per sesi dan pertambahan RSS."""
+    results = [{} for _ in range(sessions)]
+    threads = [threading.Thread(target=run_session, args=(source, timeout, result)) for result in results]
+    rss = _rss_mb()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - start, _rss_mb() - rss
+
+
+def _latency(results, key):
+    values = np.array([result[key] for result in results if key in result])
+    if not len(values):
+        return None
+    return {'p50': float(np.percentile(values, 50)), 'p95': float(np.percentile(values, 95)),
+            'max': float(values.max())}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=8, help='jumlah sesi bersamaan')
+    parser.add_argument('--budget-mb', type=float, help='anggaran memori cache bersama (default: BIKESHARE_MEMORY_BUDGET_MB)')
+    parser.add_argument('--timeout', type=float, default=600, help='batas waktu satu run skrip (detik)')
+    parser.add_argument('--output', help='file JSON hasil (default: stdout)')
+    args = parser.parse_args()
+
+    if args.budget_mb is not None:
+        SHARED_CACHE.budget = int(args.budget_mb * 2 ** 20)
+    with open(SCRIPT) as f:
+        source = f.read().replace(PAGE_LINK, '')
+
+    # Sesi pertama mengisi cache (cold), gelombang berikutnya memakai cache bersama (warm)
+    rss_start = _rss_mb()
+    cold, cold_wall, cold_rss = run_wave(source, 1, args.timeout)
+    warm, warm_wall, warm_rss = run_wave(source, args.sessions, args.timeout)
+    results = cold + warm
+
+    report = {
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'streamlit': streamlit.__version__,
+        },
+        'sessions': args.sessions,
+        'cold': {'wall': cold_wall, 'rss_growth_mb': cold_rss,
+                 'first_run': _latency(cold, 'first_run'), 'filter_run': _latency(cold, 'filter_run')},
+        'warm': {'wall': warm_wall, 'rss_growth_mb': warm_rss,
+                 'rss_growth_per_session_mb': warm_rss / args.sessions,
+                 'first_run': _latency(warm, 'first_run'), 'filter_run': _latency(warm, 'filter_run')},
+        'rss_mb': {'start': rss_start, 'end': _rss_mb()},
+        'shared_cache': SHARED_CACHE.stats(),
+        'exceptions': sorted({text for result in results for text in result.get('exceptions', [])}),
+        'unexpected_session_keys': sorted({key for result in results
+                                           for key in result.get('session_state', []) if key not in FILTER_KEYS}),
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    warm_report = report['warm']
+    print(f"{args.sessions} sesi: run pertama p50 {warm_report['first_run']['p50']:.2f} s, "
+          f"filter p50 {warm_report['filter_run']['p50']:.2f} s, "
+          f"RSS +{warm_report['rss_growth_per_session_mb']:.1f} MB/sesi", file=sys.stderr)
+    cache = report['shared_cache']
+    print(f"cache bersama: {cache['entries']} hasil, {cache['mb']:.1f}/{cache['budget_mb']:.0f} MB, "
+          f"{cache['evictions']} diusir", file=sys.stderr)
+    if report['exceptions'] or report['unexpected_session_keys']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"""Komponen pendukung dashboard analisis bike sharing (uas_streamlit.py)."""
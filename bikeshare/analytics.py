@@ -0,0 +1,321 @@
+"""Analisis dashboard tanpa UI: setiap fungsi mengembalikan DataFrame/Series biasa.
+
+Dipakai oleh uas_streamlit.py dan oleh batch CLI di bawah yang menghitung
+semua hasil sekali lalu menyimpannya ke disk bersama versi data sumbernya
+(pickle untuk dibaca ulang front-end, CSV untuk laporan). Modul ini tidak
+mengimpor streamlit, matplotlib maupun seaborn; statsmodels dan scikit-learn
+baru diimpor ketika dekomposisi atau segmentasi dipanggil.
+
+    python -m bikeshare.analytics --output datasets/results
+"""
+import argparse
+import json
+import os
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+
+from bikeshare.binning import WEATHER_COLUMNS, WINDSPEED_EDGES, WINDSPEED_LABELS, binned_stats, equal_edges
+from bikeshare.charts import downsample
+from bikeshare.correlation import CORRELATION_COLUMNS, correlation_sketch
+from bikeshare.cube import build_cube, rollup
+from bikeshare.features import add_labels, time_of_day, weather_category, weekend_as_holiday
+from bikeshare.ingest import FIRST_YEAR, HourlyIngest, data_version, ingested_segments, load_frames
+from bikeshare.outliers import DEFAULT_CHUNKSIZE, outlier_mask
+from bikeshare.store import DATASET_DIR
+from bikeshare.timing import stage
+
+RESULTS_DIR = os.path.join(DATASET_DIR, 'results')
+RESULTS_MANIFEST = 'manifest.json'
+
+# Nilai yr dihitung dari tahun pertama data (0 = 2011); batch ingest bisa menambah tahun baru
+YEAR_NAMES = {0: 'Tahun Pertama', 1: 'Tahun Kedua', 2: 'Tahun Ketiga', 3: 'Tahun Keempat', 4: 'Tahun Kelima'}
+DAY_NAMES = {0: 'Senin', 1: 'Selasa', 2: 'Rabu', 3: 'Kamis', 4: 'Jumat', 5: 'Sabtu', 6: 'Minggu'}
+WEEKDAY_ORDER = list(DAY_NAMES.values())
+SEASON_NAMES = {1: "Spring", 2: "Summer", 3: "Fall", 4: "Winter"}
+SEASONAL_NAMES = {7: 'mingguan', 24: 'harian', 168: 'mingguan', 365: 'tahunan'}
+
+# Bin halus untuk sebaran total peminjaman terhadap windspeed (lebar 0.02)
+WINDSPEED_FINE_BINS = 50
+DISTRIBUTION_QUANTILES = 5
+
+
+def load_data():
+    """(day_data, hour_data) termasuk batch ingest, dengan label rentang_waktu dan weather_category."""
+    with stage("muat data"):
+        day_data, hour_data = load_frames()
+        return day_data, add_labels(hour_data)
+
+
+def remove_outliers(hour_data, threshold=3):
+    """Baris hour_data dengan |z-score| cnt <= threshold."""
+    with stage("bersihkan outlier"):
+        return hour_data[outlier_mask(hour_data, 'cnt', threshold=threshold)]
+
+
+def ingest_state():
+    """State HourlyIngest jika sudah ada batch ingest di disk, selain itu None.
+
+    Hanya untuk data dari load_data(): kubus dan sketch di state tersebut
+    mencakup data dasar ditambah semua batch, bukan frame sembarang.
+    """
+    return HourlyIngest.open() if ingested_segments() else None
+
+
+def build_cubes(hour_data, threshold=3, ingest=None):
+    """(kubus penuh, kubus tanpa outlier) dari hour_data, atau dari state `ingest` bila diberikan."""
+    if ingest is not None:
+        with stage("kubus agregasi (ingest)"):
+            return ingest.cube, ingest.cleaned_cube(threshold)
+    cleaned = remove_outliers(hour_data, threshold)
+    with stage("kubus agregasi"):
+        return build_cube(hour_data), build_cube(cleaned)
+
+
+def year_values(frame):
+    """Nilai yr yang ada di data atau kubus, urut naik."""
+    return tuple(int(yr) for yr in np.unique(frame['yr'].to_numpy()))
+
+
+def calendar_year(yr):
+    return FIRST_YEAR + int(yr)
+
+
+def year_name(yr):
+    return YEAR_NAMES.get(int(yr), f'Tahun ke-{int(yr) + 1}')
+
+
+def _where_years(yr_values):
+    # Tanpa yr_values: semua tahun yang ada di kubus
+    return None if yr_values is None else {'yr': list(yr_values)}
+
+
+def monthly_trend(hour_cube):
+    return rollup(hour_cube, ['yr', 'mnth'], ['cnt']).reset_index()
+
+
+def weekday_users(cleaned_cube, yr_values=None):
+    """Total casual dan registered per nama hari, urut Senin..Minggu (hari tanpa data bernilai 0)."""
+    totals = rollup(cleaned_cube, ['weekday'], ['casual', 'registered'], where=_where_years(yr_values)).reset_index()
+    totals['weekday'] = totals['weekday'].map(DAY_NAMES)
+    # Tahun dari batch ingest yang pendek bisa belum mencakup ketujuh hari
+    return totals.set_index('weekday').reindex(WEEKDAY_ORDER, fill_value=0).reset_index()
+
+
+def time_of_day_totals(cleaned_cube, yr_values=None):
+    """(total per rentang_waktu, total per yr x rentang_waktu); label dihitung pada sel kubus.
+
+    Hanya rentang waktu yang ada datanya yang muncul (observed=True).
+    """
+    hourly = rollup(cleaned_cube, ['yr', 'hr'], ['cnt'], where=_where_years(yr_values)).reset_index()
+    hourly['rentang_waktu'] = time_of_day(hourly['hr'])
+    totals = hourly.groupby('rentang_waktu', observed=True)['cnt'].sum().reset_index()
+    by_year = hourly.groupby(['yr', 'rentang_waktu'], observed=True)['cnt'].sum().reset_index()
+    return totals, by_year
+
+
+def weather_totals(cleaned_cube, yr_values=None):
+    """Total cnt dan proporsinya per kategori cuaca yang ada datanya."""
+    weather = rollup(cleaned_cube, ['weathersit'], ['cnt'], where=_where_years(yr_values)).reset_index()
+    weather['weather_category'] = weather_category(weather['weathersit'])
+    totals = weather.groupby('weather_category', observed=True)['cnt'].sum().reset_index()
+    totals['proportion'] = totals['cnt'] / totals['cnt'].sum()
+    return totals
+
+
+def segment_data(hour_data, yr_values=None):
+    """Fitur segmentasi (hr, weathersit, cnt) dari baris bersih untuk tahun terpilih (default semua)."""
+    cleaned = remove_outliers(hour_data)
+    if yr_values is not None:
+        cleaned = cleaned[cleaned['yr'].isin(yr_values)]
+    return cleaned[['hr', 'weathersit', 'cnt']]
+
+
+def segment_points(model, cluster_data):
+    """Sampel titik (hr, cnt) beserta label cluster dari model yang sudah dilatih."""
+    from bikeshare.segmentation import assign_segments
+
+    points = downsample(cluster_data)
+    return points[['hr', 'cnt']].assign(cluster=assign_segments(model, points))
+
+
+def segments(hour_data, yr_values=None, n_clusters=3):
+    from bikeshare.segmentation import fit_segments
+
+    cluster_data = segment_data(hour_data, yr_values)
+    with stage("KMeans"):
+        model = fit_segments(cluster_data, n_clusters=n_clusters)
+    return segment_points(model, cluster_data)
+
+
+def _cleaned_chunks(hour_data, threshold=3, chunksize=DEFAULT_CHUNKSIZE):
+    # Baris tanpa outlier per potongan, tanpa menyalin seluruh frame bersih sekaligus
+    mask = outlier_mask(hour_data, 'cnt', threshold=threshold)
+    for start in range(0, len(hour_data), chunksize):
+        yield hour_data.iloc[start:start + chunksize][mask[start:start + chunksize]]
+
+
+def cleaned_correlation_sketch(hour_data, threshold=3, ingest=None):
+    """CorrelationSketch baris tanpa outlier dari hour_data, atau dari state `ingest` bila diberikan."""
+    if ingest is not None:
+        return ingest.cleaned_correlation(threshold)
+    return correlation_sketch(_cleaned_chunks(hour_data, threshold))
+
+
+def correlation(hour_data, method='pearson', columns=CORRELATION_COLUMNS, ingest=None):
+    return cleaned_correlation_sketch(hour_data, ingest=ingest).correlation(method, columns)
+
+
+def component_labels(components):
+    """Nama komponen untuk grafik, urut seperti panel time series semula."""
+    labels = {'trend': 'Trend'}
+    for column in components.columns:
+        if column.startswith('seasonal_'):
+            period = int(column.split('_')[1])
+            labels[column] = f"Seasonality ({SEASONAL_NAMES.get(period, period)})"
+    labels.update({'resid': 'Residuals', 'observed': 'Original Data'})
+    return components[list(labels)].rename(columns=labels)
+
+
+def _decompose(series, periods, model):
+    from bikeshare.decomposition import decompose
+
+    # Dengan model (IncrementalDecomposition milik pemanggil), versi data berikutnya cukup
+    # memperbarui ujung deret; tanpa model, dekomposisi penuh
+    components = decompose(series, periods) if model is None else model.update(series)
+    components = component_labels(components)
+    components.index.name = 'dteday'
+    return components
+
+
+def decomposition(day_data, model=None):
+    """Dekomposisi STL/MSTL harian (musiman mingguan dan tahunan)."""
+    from bikeshare.decomposition import DAY_PERIODS, daily_series
+
+    with stage("dekomposisi harian"):
+        return _decompose(daily_series(day_data), DAY_PERIODS, model)
+
+
+def hourly_decomposition(hour_data, model=None):
+    """Dekomposisi MSTL per jam (musiman harian dan mingguan)."""
+    from bikeshare.decomposition import HOUR_PERIODS, hourly_series
+
+    with stage("dekomposisi per jam"):
+        return _decompose(hourly_series(hour_data), HOUR_PERIODS, model)
+
+
+def windspeed_bins(hour_data):
+    """(statistik cnt per bin halus windspeed, statistik cnt per kategori windspeed) dari data per jam."""
+    fine = binned_stats(hour_data, 'windspeed', edges=equal_edges(WINDSPEED_FINE_BINS))
+    categories = binned_stats(hour_data, 'windspeed', edges=WINDSPEED_EDGES, labels=WINDSPEED_LABELS)
+    return fine, categories
+
+
+def weather_distribution(hour_data, column, quantiles=DISTRIBUTION_QUANTILES):
+    """Statistik cnt per jam pada bin kuantil kolom cuaca (windspeed, temp, hum atau atemp)."""
+    return binned_stats(hour_data, column, quantiles=quantiles)
+
+
+def holiday_means(day_data):
+    """Rata-rata cnt per hari dan jenis hari; akhir pekan dihitung sebagai hari libur."""
+    ratio = day_data.assign(holiday=weekend_as_holiday(day_data))
+    ratio['weekday_name'] = ratio['weekday'].map(DAY_NAMES)
+    ratio['holiday_type'] = ratio['holiday'].map({0: 'Hari Kerja', 1: 'Hari Libur'})
+    means = ratio.groupby(['weekday_name', 'holiday_type'])['cnt'].mean().reset_index()
+    means['weekday_name'] = pd.Categorical(means['weekday_name'], categories=WEEKDAY_ORDER, ordered=True)
+    return means.sort_values('weekday_name')
+
+
+def season_means(hour_cube):
+    means = rollup(hour_cube, ['season'], stat='mean').rename(index=SEASON_NAMES).sort_index()
+    means.index.name = 'season_name'
+    return means
+
+
+def compute_all(day_data, hour_data, yr_values=None, ingest=None):
+    """Semua hasil analisis untuk satu versi data, sebagai dict nama -> DataFrame/Series.
+
+    `ingest` (lihat ingest_state()) hanya diberikan bila frame berasal dari load_data().
+    """
+    hour_cube, cleaned_cube = build_cubes(hour_data, ingest=ingest)
+    time_totals, time_by_year = time_of_day_totals(cleaned_cube, yr_values)
+    windspeed_fine, windspeed_categories = windspeed_bins(hour_data)
+    return {
+        'monthly_trend': monthly_trend(hour_cube),
+        'weekday_users': weekday_users(cleaned_cube, yr_values),
+        'time_of_day': time_totals,
+        'time_of_day_by_year': time_by_year,
+        'weather': weather_totals(cleaned_cube, yr_values),
+        'segments': segments(hour_data, yr_values),
+        'correlation': correlation(hour_data, ingest=ingest),
+        'correlation_spearman': correlation(hour_data, method='spearman', ingest=ingest),
+        'decomposition': decomposition(day_data),
+        'hourly_decomposition': hourly_decomposition(hour_data),
+        'windspeed': windspeed_fine,
+        'windspeed_ranges': windspeed_categories,
+        'holiday': holiday_means(day_data),
+        'season_means': season_means(hour_cube),
+        **{f'distribution_{column}': weather_distribution(hour_data, column) for column in WEATHER_COLUMNS},
+    }
+
+
+def _version_key(version):
+    # Tuple versi disimpan di JSON sebagai list bersarang
+    return json.loads(json.dumps(version))
+
+
+def _write_atomic(path, write, mode='w'):
+    # Ditulis ke file sementara lalu os.replace: pembaca (dan manifest lama) tidak pernah
+    # melihat file setengah jadi, juga ketika CLI dijalankan ulang pada versi data yang sama
+    staging = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(staging, mode) as f:
+            write(f)
+        os.replace(staging, path)
+    except BaseException:
+        if os.path.exists(staging):
+            os.unlink(staging)
+        raise
+
+
+def write_results(results, version, output=RESULTS_DIR):
+    """Menyimpan setiap hasil sebagai <nama>.pkl dan <nama>.csv, lalu manifest berisi versi data."""
+    os.makedirs(output, exist_ok=True)
+    for name, result in results.items():
+        _write_atomic(os.path.join(output, f'{name}.pkl'),
+                      lambda f: pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL), mode='wb')
+        _write_atomic(os.path.join(output, f'{name}.csv'), result.to_csv)
+    # Manifest ditulis terakhir: pembaca hanya memakai hasil yang tercantum dengan versi yang cocok
+    manifest = {'version': _version_key(version), 'results': sorted(results), 'created': time.time()}
+    _write_atomic(os.path.join(output, RESULTS_MANIFEST), lambda f: json.dump(manifest, f))
+
+
+def read_result(name, version, results_dir=RESULTS_DIR):
+    """Hasil batch `name` untuk versi data ini, atau None jika belum ada atau sudah usang."""
+    try:
+        with open(os.path.join(results_dir, RESULTS_MANIFEST)) as f:
+            manifest = json.load(f)
+        if manifest['version'] != _version_key(version) or name not in manifest['results']:
+            return None
+        with open(os.path.join(results_dir, f'{name}.pkl'), 'rb') as f:
+            return pickle.load(f)
+    except (OSError, EOFError, ValueError, KeyError, pickle.UnpicklingError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Menghitung semua hasil analisis dan menyimpannya ke disk.")
+    parser.add_argument('--output', default=RESULTS_DIR)
+    args = parser.parse_args()
+
+    version = data_version()
+    start = time.perf_counter()
+    results = compute_all(*load_data(), ingest=ingest_state())
+    write_results(results, version, args.output)
+    print(f'{len(results)} hasil -> {args.output} ({time.perf_counter() - start:.1f}s)')
+
+
+if __name__ == '__main__':
+    main()
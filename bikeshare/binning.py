@@ -0,0 +1,156 @@
+"""Statistik peminjaman per bin variabel cuaca dalam satu lintasan vektor.
+
+BinnedStats menyimpan count, sum dan sum-of-squares measure (misalnya cnt)
+per bin; indeks bin dihitung dengan np.digitize dan dijumlahkan dengan
+np.bincount, sehingga bisa diperbarui per potongan data dan digabung antar
+potongan. Bin bersifat tertutup kanan seperti pd.cut, dengan tepi terbawah
+ikut masuk bin pertama (windspeed = 0 tidak terbuang).
+
+Bin kuantil juga cukup satu lintasan: statistik dikumpulkan dulu pada grid
+halus di rentang nilai ternormalisasi (0..1, lihat datasets/Readme.txt), lalu
+bin-bin halus digabung pada tepi yang paling dekat dengan kuantil yang diminta.
+"""
+import numpy as np
+import pandas as pd
+
+from bikeshare.outliers import DEFAULT_CHUNKSIZE, iter_chunks
+
+WEATHER_COLUMNS = ('windspeed', 'temp', 'hum', 'atemp')
+
+# Semua kolom cuaca dinormalisasi ke 0..1
+VALUE_RANGE = (0.0, 1.0)
+
+# Lebar bin grid halus untuk bin kuantil (presisi tepi kuantil)
+FINE_BINS = 1000
+
+WINDSPEED_EDGES = (0, 0.1, 0.2, 0.3, 0.4, 1.0)
+WINDSPEED_LABELS = ('Sangat Rendah', 'Rendah', 'Sedang', 'Tinggi', 'Sangat Tinggi')
+
+
+class BinnedStats:
+    """count, sum dan sum-of-squares measure per bin, diperbarui per potongan data."""
+
+    def __init__(self, edges):
+        self.edges = np.asarray(edges, dtype=np.float64)
+        if self.edges.ndim != 1 or len(self.edges) < 2 or (np.diff(self.edges) <= 0).any():
+            raise ValueError("edges harus naik tegas dan berisi minimal dua tepi")
+        n_bins = len(self.edges) - 1
+        self.count = np.zeros(n_bins, dtype=np.int64)
+        self.sum = np.zeros(n_bins)
+        self.sumsq = np.zeros(n_bins)
+
+    def bin_index(self, values):
+        """Indeks bin (0-based) tiap nilai; -1 untuk nilai di luar rentang tepi."""
+        values = np.asarray(values)
+        if values.dtype.kind != 'f':
+            values = values.astype(np.float64)
+        # Tepi dibandingkan dalam dtype nilai: kolom float32 dari store berisi 0.3 sebagai
+        # float32(0.3), yang sedikit di atas 0.3 float64 dan akan jatuh ke bin berikutnya
+        edges = self.edges.astype(values.dtype)
+        index = np.digitize(values, edges, right=True) - 1
+        # Tepi terbawah masuk bin pertama (include_lowest pada pd.cut)
+        index[values == edges[0]] = 0
+        index[(values < edges[0]) | (values > edges[-1]) | np.isnan(values)] = -1
+        return index
+
+    def update(self, values, measure):
+        index = self.bin_index(values)
+        measure = np.asarray(measure, dtype=np.float64)
+        inside = index >= 0
+        index, measure = index[inside], measure[inside]
+        n_bins = len(self.count)
+        self.count += np.bincount(index, minlength=n_bins)
+        self.sum += np.bincount(index, weights=measure, minlength=n_bins)
+        self.sumsq += np.bincount(index, weights=measure * measure, minlength=n_bins)
+        return self
+
+    def merge(self, other):
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("hanya BinnedStats dengan tepi yang sama yang bisa digabung")
+        self.count += other.count
+        self.sum += other.sum
+        self.sumsq += other.sumsq
+        return self
+
+    def regroup(self, edges):
+        """BinnedStats baru dengan bin yang lebih kasar; setiap tepi baru harus tepi yang sudah ada."""
+        edges = np.asarray(edges, dtype=np.float64)
+        position = np.searchsorted(self.edges, edges)
+        if (position >= len(self.edges)).any() or not np.array_equal(self.edges[position], edges):
+            raise ValueError("tepi baru harus merupakan subset dari tepi lama")
+        coarse = BinnedStats(edges)
+        # Bin halus ke-i masuk bin kasar yang tepi kanannya >= tepi kanan bin halus tersebut
+        target = np.searchsorted(position, np.arange(1, len(self.edges)), side='left') - 1
+        inside = (target >= 0) & (target < len(edges) - 1)
+        coarse.count = np.bincount(target[inside], self.count[inside], minlength=len(edges) - 1).astype(np.int64)
+        coarse.sum = np.bincount(target[inside], self.sum[inside], minlength=len(edges) - 1)
+        coarse.sumsq = np.bincount(target[inside], self.sumsq[inside], minlength=len(edges) - 1)
+        return coarse
+
+    def quantile_edges(self, n_bins):
+        """Tepi untuk n_bins bin berfrekuensi (kurang lebih) sama, dipilih dari tepi yang ada."""
+        cumulative = np.concatenate([[0], np.cumsum(self.count)])
+        if not cumulative[-1]:
+            return self.edges[[0, -1]]
+        targets = cumulative[-1] * np.arange(1, n_bins) / n_bins
+        inner = self.edges[np.searchsorted(cumulative, targets, side='left')]
+        return np.unique(np.concatenate([self.edges[[0]], inner, self.edges[[-1]]]))
+
+    def table(self, confidence=0.95, labels=None):
+        """Ringkasan per bin: count, share, sum, mean, std, sem dan selang kepercayaan mean.
+
+        Selang memakai distribusi t (ddof=1); bin dengan kurang dari dua
+        baris tidak memiliki std/selang (NaN).
+        """
+        from scipy import stats
+
+        count = self.count.astype(np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = self.sum / count
+            variance = np.clip((self.sumsq - self.sum * mean) / (count - 1), 0, None)
+            std = np.where(count > 1, np.sqrt(variance), np.nan)
+            sem = std / np.sqrt(count)
+            margin = stats.t.ppf((1 + confidence) / 2, np.maximum(count - 1, 1)) * sem
+            share = count / count.sum()
+        index = pd.IntervalIndex.from_breaks(self.edges, closed='right', name='bin')
+        result = pd.DataFrame({
+            'count': self.count,
+            'share': share,
+            'sum': self.sum,
+            'mean': mean,
+            'std': std,
+            'sem': sem,
+            'ci_low': mean - margin,
+            'ci_high': mean + margin,
+        }, index=index)
+        if labels is not None:
+            result.insert(0, 'label', list(labels))
+        return result
+
+
+def equal_edges(n_bins, value_range=VALUE_RANGE):
+    # Dibulatkan agar tepi seperti 0.3 tidak tampil sebagai 0.30000000000000004
+    return np.round(np.linspace(value_range[0], value_range[1], n_bins + 1), 12)
+
+
+def binned_stats(data, column, measure='cnt', edges=None, quantiles=None, confidence=0.95,
+                 labels=None, value_range=VALUE_RANGE, chunksize=DEFAULT_CHUNKSIZE):
+    """Statistik `measure` per bin `column` dari frame atau iterator potongan frame.
+
+    Bin ditentukan oleh `edges` (tetap), atau `quantiles` = jumlah bin
+    berfrekuensi sama; tanpa keduanya dipakai 10 bin selebar sama pada
+    `value_range`. Keduanya diproses dalam satu lintasan atas data.
+    """
+    if edges is not None and quantiles is not None:
+        raise ValueError("pilih salah satu: edges atau quantiles")
+    if quantiles is not None:
+        accumulator = BinnedStats(equal_edges(FINE_BINS, value_range))
+    else:
+        accumulator = BinnedStats(equal_edges(10, value_range) if edges is None else edges)
+    for chunk in iter_chunks(data, chunksize):
+        accumulator.update(chunk[column].to_numpy(), chunk[measure].to_numpy())
+    if quantiles is not None:
+        accumulator = accumulator.regroup(accumulator.quantile_edges(quantiles))
+    result = accumulator.table(confidence, labels)
+    result.index = result.index.rename(column)
+    return result
@@ -0,0 +1,209 @@
+"""Cache render grafik dan jalur grafik ringan (Vega-Lite) untuk dashboard.
+
+Gambar matplotlib disimpan sebagai PNG dengan kunci hash isi data agregat
+yang digambarkan, sehingga panel yang datanya tidak berubah tidak perlu
+digambar ulang. Fungsi *_spec menghasilkan spesifikasi Vega-Lite (JSON) yang
+dirender di browser sebagai alternatif yang lebih ringan daripada matplotlib.
+"""
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from bikeshare.timing import note_cache
+
+# Pengaturan savefig yang sama dengan st.pyplot
+SAVEFIG_OPTIONS = {'format': 'png', 'bbox_inches': 'tight', 'dpi': 200}
+
+# Lebar maksimum gambar yang dikirim Streamlit; gambar yang lebih lebar diperkecil olehnya
+# di setiap rerun, jadi pengecilan dilakukan sekali saja sebelum masuk cache
+MAX_IMAGE_WIDTH = 1460
+
+# Batas titik untuk scatter data per jam
+MAX_SCATTER_POINTS = 5000
+
+# pyplot menyimpan state global dan tidak thread-safe: render dari beberapa sesi dijalankan bergantian
+RENDER_LOCK = threading.Lock()
+
+
+def content_hash(*parts):
+    """Hash isi DataFrame/Series/array/nilai biasa untuk kunci cache."""
+    digest = hashlib.sha1()
+    for part in parts:
+        if isinstance(part, (pd.DataFrame, pd.Series)):
+            labels = part.columns if isinstance(part, pd.DataFrame) else [part.name]
+            digest.update(repr(list(labels)).encode())
+            digest.update(pd.util.hash_pandas_object(part, index=True).to_numpy().tobytes())
+        elif isinstance(part, np.ndarray):
+            digest.update(f'{part.dtype}{part.shape}'.encode())
+            digest.update(np.ascontiguousarray(part).tobytes())
+        else:
+            digest.update(repr(part).encode())
+    return digest.hexdigest()
+
+
+class FigureCache:
+    """Cache LRU untuk gambar yang sudah dirender (PNG bytes)."""
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(self, key, render):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                note_cache(hit=True)
+                return self._entries[key]
+            self.misses += 1
+        note_cache(hit=False)
+        image = render()
+        with self._lock:
+            self._entries[key] = image
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return image
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+FIGURE_CACHE = FigureCache()
+
+
+def figure_png(fig, max_width=MAX_IMAGE_WIDTH):
+    """Menyimpan figure ke PNG (paling lebar max_width piksel) lalu menutupnya."""
+    import matplotlib.pyplot as plt
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, **SAVEFIG_OPTIONS)
+    plt.close(fig)
+
+    image = Image.open(buffer)
+    if image.width <= max_width:
+        return buffer.getvalue()
+    height = int(image.height * max_width / image.width)
+    resized = io.BytesIO()
+    image.resize((max_width, height), resample=Image.BILINEAR).save(resized, format='PNG')
+    return resized.getvalue()
+
+
+def cached_png(name, render, *data, cache=FIGURE_CACHE):
+    """PNG hasil render(*data), dirender ulang hanya jika isi data berubah."""
+    key = (name, content_hash(*data))
+
+    def render_png():
+        with RENDER_LOCK:
+            return figure_png(render(*data))
+    return cache.get_or_render(key, render_png)
+
+
+def downsample(frame, max_points=MAX_SCATTER_POINTS, random_state=42):
+    """Sampel acak (tetap untuk data yang sama) agar scatter tidak menggambar semua baris."""
+    if len(frame) <= max_points:
+        return frame
+    return frame.sample(n=max_points, random_state=random_state).sort_index()
+
+
+def _axis(field, title=None, kind='quantitative', **extra):
+    encoding = {'field': field, 'type': kind}
+    if title is not None:
+        encoding['title'] = title
+    encoding.update(extra)
+    return encoding
+
+
+def line_spec(x, y, color=None, title=None, x_title=None, y_title=None, x_kind='quantitative', row=None):
+    """Grafik garis; dengan `row` tiap nilai kolom tersebut digambar di panel terpisah."""
+    spec = {
+        'mark': {'type': 'line', 'point': row is None},
+        'encoding': {'x': _axis(x, x_title, x_kind), 'y': _axis(y, y_title)},
+    }
+    if color is not None:
+        spec['encoding']['color'] = _axis(color, kind='nominal')
+    if row is not None:
+        spec['encoding']['row'] = _axis(row, kind='nominal', sort=None)
+        spec['resolve'] = {'scale': {'y': 'independent'}}
+    if title is not None:
+        spec['title'] = title
+    return spec
+
+
+def bar_spec(x, y, color=None, title=None, x_title=None, y_title=None, sort=None):
+    """Grafik batang; dengan `color` batang dikelompokkan berdampingan (xOffset)."""
+    spec = {
+        'mark': 'bar',
+        'encoding': {'x': _axis(x, x_title, 'nominal', sort=sort), 'y': _axis(y, y_title)},
+    }
+    if color is not None:
+        spec['encoding']['color'] = _axis(color, kind='nominal')
+        spec['encoding']['xOffset'] = _axis(color, kind='nominal')
+    if title is not None:
+        spec['title'] = title
+    return spec
+
+
+def arc_spec(theta, color, title=None):
+    spec = {
+        'mark': 'arc',
+        'encoding': {'theta': _axis(theta), 'color': _axis(color, kind='nominal')},
+    }
+    if title is not None:
+        spec['title'] = title
+    return spec
+
+
+def scatter_spec(x, y, color=None, title=None, x_title=None, y_title=None):
+    spec = {
+        'mark': {'type': 'circle', 'opacity': 0.5},
+        'encoding': {'x': _axis(x, x_title), 'y': _axis(y, y_title)},
+    }
+    if color is not None:
+        spec['encoding']['color'] = _axis(color, kind='nominal')
+    if title is not None:
+        spec['title'] = title
+    return spec
+
+
+def heatmap_spec(title=None):
+    """Heatmap untuk frame panjang hasil long_matrix() (kolom row, column, value)."""
+    encoding = {
+        'x': _axis('column', '', 'nominal', sort=None),
+        'y': _axis('row', '', 'nominal', sort=None),
+    }
+    spec = {
+        'layer': [
+            {'mark': 'rect',
+             'encoding': {**encoding, 'color': _axis('value', scale={'scheme': 'redblue', 'reverse': True})}},
+            {'mark': 'text',
+             'encoding': {**encoding, 'text': _axis('value', format='.2f')}},
+        ],
+    }
+    if title is not None:
+        spec['title'] = title
+    return spec
+
+
+def long_matrix(matrix):
+    """Mengubah matriks (misalnya hasil .corr()) menjadi frame panjang untuk heatmap_spec()."""
+    long = matrix.rename_axis(index='row', columns='column').stack().rename('value')
+    return long.reset_index()
+
+
+def fold(spec, columns, as_=('key', 'value')):
+    """Menambahkan transform fold (kolom lebar menjadi pasangan key/value) pada spesifikasi."""
+    return {**spec, 'transform': [{'fold': list(columns), 'as': list(as_)}]}
+
+
+def concat_spec(*specs, direction='hconcat'):
+    """Menggabungkan beberapa spesifikasi yang memakai data yang sama."""
+    return {direction: list(specs)}
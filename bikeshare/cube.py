@@ -0,0 +1,80 @@
+"""Kubus agregasi (rollup) untuk panel-panel groupby di dashboard.
+
+Setiap sel kubus menyimpan count, sum dan sum-of-squares untuk cnt, casual dan
+registered pada kombinasi yr x mnth x weekday x hr x weathersit x season x
+holiday. Panel cukup mengiris dan menjumlahkan sel, sehingga biayanya
+bergantung pada jumlah sel (paling banyak ~64 ribu), bukan jumlah baris jam.
+"""
+import numpy as np
+import pandas as pd
+
+DIMENSIONS = ('yr', 'mnth', 'weekday', 'hr', 'weathersit', 'season', 'holiday')
+MEASURES = ('cnt', 'casual', 'registered')
+STATS = ('sum', 'count', 'mean', 'std')
+
+
+def build_cube(frame, dimensions=DIMENSIONS, measures=MEASURES):
+    """Membangun kubus dari frame level jam (hour_data atau hasil pembersihan)."""
+    columns = {dim: frame[dim].to_numpy() for dim in dimensions}
+    columns['count'] = np.ones(len(frame), dtype=np.int64)
+    for measure in measures:
+        values = frame[measure].to_numpy()
+        columns[f'{measure}_sum'] = values.astype(np.int64 if values.dtype.kind in 'iub' else np.float64)
+        columns[f'{measure}_sumsq'] = np.square(values, dtype=np.float64)
+    cells = pd.DataFrame(columns, copy=False)
+    return cells.groupby(list(dimensions), sort=True).sum().reset_index()
+
+
+def merge_cubes(*cubes, dimensions=DIMENSIONS):
+    """Menjumlahkan sel-sel beberapa kubus, misalnya kubus lama dengan kubus batch baru."""
+    return pd.concat(cubes, ignore_index=True).groupby(list(dimensions), sort=True).sum().reset_index()
+
+
+def subtract_cube(cube, other, dimensions=DIMENSIONS):
+    """Mengurangkan sel-sel `other` (subset baris `cube`) dari `cube`; sel yang kosong dibuang."""
+    if not len(other):
+        return cube
+    values = [column for column in other.columns if column not in dimensions]
+    negated = other.assign(**{column: -other[column] for column in values})
+    merged = merge_cubes(cube, negated, dimensions=dimensions)
+    return merged[merged['count'] > 0].reset_index(drop=True)
+
+
+def slice_cube(cube, where=None):
+    """Memilih sel yang memenuhi filter, misalnya where={'yr': [0, 1]}."""
+    if not where:
+        return cube
+    mask = np.ones(len(cube), dtype=bool)
+    for dim, values in where.items():
+        mask &= cube[dim].isin(np.atleast_1d(values)).to_numpy()
+    return cube[mask]
+
+
+def rollup(cube, by, measures=MEASURES, stat='sum', where=None):
+    """Menjawab groupby(by)[measures].<stat>() langsung dari kubus.
+
+    Hasilnya berindeks `by`, sama seperti groupby pada pandas.
+    """
+    if stat not in STATS:
+        raise ValueError(f"stat harus salah satu dari {STATS}, bukan {stat!r}")
+    by = list(by)
+    measures = list(measures)
+    sums = [f'{m}_sum' for m in measures]
+    sumsqs = [f'{m}_sumsq' for m in measures]
+    grouped = slice_cube(cube, where).groupby(by, sort=True)[['count'] + sums + sumsqs].sum()
+
+    count = grouped['count']
+    if stat == 'count':
+        return pd.DataFrame({m: count for m in measures}, index=grouped.index)
+
+    result = {}
+    for measure, total, squares in zip(measures, sums, sumsqs):
+        if stat == 'sum':
+            result[measure] = grouped[total]
+        elif stat == 'mean':
+            result[measure] = grouped[total] / count
+        else:
+            # Simpangan baku sampel (ddof=1), sama seperti pandas
+            variance = (grouped[squares] - grouped[total] ** 2 / count) / (count - 1)
+            result[measure] = np.sqrt(variance.clip(lower=0))
+    return pd.DataFrame(result, index=grouped.index)
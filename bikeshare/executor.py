@@ -0,0 +1,39 @@
+"""Eksekutor paralel untuk komputasi data panel dashboard.
+
+Data setiap panel dihitung bersamaan di thread (atau proses) pool, lalu
+hasilnya dikembalikan dalam urutan panel sehingga render tetap berurutan di
+thread utama (matplotlib/pyplot tidak aman dipakai dari banyak thread).
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+POOLS = {'thread': ThreadPoolExecutor, 'process': ProcessPoolExecutor}
+
+# Jumlah worker bawaan, bisa diatur lewat variabel lingkungan BIKESHARE_MAX_WORKERS
+DEFAULT_MAX_WORKERS = int(os.environ.get('BIKESHARE_MAX_WORKERS', min(8, os.cpu_count() or 1)))
+
+
+def _timed(task):
+    start = time.perf_counter()
+    result = task()
+    return result, time.perf_counter() - start
+
+
+def run_panels(tasks, max_workers=None, kind='thread', initializer=None):
+    """Menjalankan tasks (dict nama -> callable tanpa argumen) secara bersamaan.
+
+    Mengembalikan (hasil, waktu): dua dict dengan urutan kunci sama seperti
+    tasks, waktu berupa wall time tiap panel dalam detik. Untuk kind='process'
+    setiap task harus bisa di-pickle (misalnya functools.partial dari fungsi
+    tingkat modul). Exception dari sebuah task dilempar ulang apa adanya.
+    """
+    if kind not in POOLS:
+        raise ValueError(f"kind harus salah satu dari {tuple(POOLS)}, bukan {kind!r}")
+    workers = max(1, min(max_workers or DEFAULT_MAX_WORKERS, len(tasks)))
+    results, timings = {}, {}
+    with POOLS[kind](max_workers=workers, initializer=initializer) as pool:
+        futures = {name: pool.submit(_timed, task) for name, task in tasks.items()}
+        for name, future in futures.items():
+            results[name], timings[name] = future.result()
+    return results, timings
@@ -0,0 +1,56 @@
+"""Turunan fitur berbasis tabel lookup (tanpa Series.apply per baris).
+
+Label dikembalikan sebagai pd.Categorical dengan kategori terurut alfabetis,
+sehingga urutan hasil groupby sama dengan urutan label string sebelumnya.
+"""
+import numpy as np
+import pandas as pd
+
+# Rentang waktu untuk jam 0..23: Pagi 6-11, Siang 12-17, Sore 18-19, sisanya Malam
+TIME_OF_DAY_BY_HOUR = np.array(['Malam'] * 6 + ['Pagi'] * 6 + ['Siang'] * 6 + ['Sore'] * 2 + ['Malam'] * 4)
+
+# Kategori cuaca untuk weathersit 0..4 (0 bukan kode yang valid)
+WEATHER_BY_CODE = np.array([
+    'Tidak Valid',
+    'Cerah/Sedikit berawan',
+    'Berawan/Berkabut',
+    'Hujan Salju/Badai',
+    'Cuaca Ekstrim',
+])
+
+WEEKEND_DAYS = (5, 6)
+
+
+def _lookup(codes, table, fallback):
+    """Memetakan kode integer ke label lewat tabel; kode di luar tabel diberi `fallback`."""
+    categories = np.unique(np.append(table, fallback))
+    table_codes = np.searchsorted(categories, table)
+    fallback_code = np.searchsorted(categories, fallback)
+
+    codes = np.asarray(codes, dtype=np.int64)
+    valid = (codes >= 0) & (codes < len(table))
+    label_codes = np.where(valid, table_codes[np.where(valid, codes, 0)], fallback_code)
+    return pd.Categorical.from_codes(label_codes, categories)
+
+
+def time_of_day(hr):
+    return _lookup(hr, TIME_OF_DAY_BY_HOUR, 'Malam')
+
+
+def weather_category(weathersit):
+    return _lookup(weathersit, WEATHER_BY_CODE, 'Tidak Valid')
+
+
+def weekend_as_holiday(frame):
+    """Kolom holiday dengan Sabtu dan Minggu (weekday 5 dan 6) ikut dihitung sebagai hari libur."""
+    weekend = np.isin(frame['weekday'].to_numpy(), WEEKEND_DAYS)
+    holiday = frame['holiday'].to_numpy()
+    return np.where(weekend, 1, holiday).astype(holiday.dtype)
+
+
+def add_labels(hour_data):
+    """Menambahkan kolom kategorikal rentang_waktu dan weather_category tanpa menyalin kolom lain."""
+    return hour_data.assign(
+        rentang_waktu=time_of_day(hour_data['hr']),
+        weather_category=weather_category(hour_data['weathersit']),
+    )
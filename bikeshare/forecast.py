@@ -0,0 +1,295 @@
+"""Prakiraan permintaan per jam (casual, registered dan cnt) dari fitur kalender dan cuaca.
+
+Satu HistGradientBoostingRegressor (loss Poisson) dilatih per target casual
+dan registered; cnt adalah jumlah keduanya sehingga ketiga prakiraan selalu
+konsisten. Fitur: hr, weekday, workingday, temp, hum, windspeed, ditambah
+weathersit dan season (prakiraan per kondisi cuaca/musim) serta yr dan mnth
+untuk tren pertumbuhan antar tahun.
+
+- predict(frame) memproses banyak jam sekaligus (prediksi ensemble sklearn);
+- score(...) untuk satu jam memakai salinan pohon dalam array numpy yang
+  ditelusuri untuk semua pohon sekaligus, jauh lebih cepat daripada predict()
+  sklearn yang berjalan per pohon untuk batch kecil. Salinan ini membaca
+  atribut internal sklearn, jadi saat fit hasilnya dicocokkan dulu dengan
+  predict() pada sampel baris; jika berbeda (misalnya setelah upgrade
+  scikit-learn), semua prakiraan memakai predict() sklearn;
+- load_forecaster() menyimpan model di datasets/cache/models dengan kunci versi
+  data, fitur dan parameter, sehingga model hanya dilatih ulang bila data berubah;
+- backtest() mengevaluasi model secara rolling-origin dan melaporkan akurasi
+  serta throughput (lihat benchmarks/bench_forecast.py).
+
+    python -m bikeshare.forecast jam_mendatang.csv --output prakiraan.csv
+"""
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import HistGradientBoostingRegressor
+
+from bikeshare.ingest import data_version, load_frames
+from bikeshare.store import CACHE_DIR
+
+FEATURES = ('hr', 'weekday', 'workingday', 'temp', 'hum', 'windspeed', 'weathersit', 'season', 'yr', 'mnth')
+TARGETS = ('casual', 'registered')
+OUTPUTS = (*TARGETS, 'cnt')
+MODEL_DIR = os.path.join(CACHE_DIR, 'models')
+
+# Tanpa early stopping pelatihan deterministik (tidak ada pembagian validasi acak)
+DEFAULT_PARAMS = {'loss': 'poisson', 'max_iter': 300, 'learning_rate': 0.1, 'early_stopping': False,
+                  'random_state': 42}
+
+# Sampai jumlah baris ini penelusuran pohon numpy lebih cepat daripada predict() sklearn
+SMALL_BATCH = 16
+
+# Jumlah baris latih yang dipakai untuk mencocokkan pohon numpy dengan predict() sklearn
+COMPILE_CHECK_ROWS = 256
+
+
+def _matrix(frame, features):
+    missing = [feature for feature in features if feature not in frame]
+    if missing:
+        raise ValueError(f"fitur prakiraan tidak ada: {missing}")
+    return np.column_stack([np.asarray(frame[feature], dtype=np.float64) for feature in features])
+
+
+class _CompiledTrees:
+    """Node semua pohon beberapa model boosting (loss Poisson) dalam array (pohon x node).
+
+    Membaca atribut internal HistGradientBoostingRegressor (_predictors dan
+    _baseline_prediction); pohon dengan split kategorikal tidak didukung.
+    """
+
+    def __init__(self, models):
+        trees = [(target, predictor.nodes) for target, model in enumerate(models)
+                 for iteration in model._predictors for predictor in iteration]
+        if any(nodes['is_categorical'].any() for _, nodes in trees):
+            raise ValueError("split kategorikal tidak didukung")
+        self.width = max(len(nodes) for _, nodes in trees)
+        self.offset = np.arange(len(trees)) * self.width
+        fields = {'feature_idx': np.intp, 'num_threshold': np.float64, 'missing_go_to_left': bool,
+                  'left': np.intp, 'right': np.intp, 'is_leaf': bool, 'value': np.float64}
+        for field, dtype in fields.items():
+            table = np.zeros((len(trees), self.width), dtype=dtype)
+            for row, (_, nodes) in enumerate(trees):
+                table[row, :len(nodes)] = nodes[field]
+            setattr(self, field, table.ravel())
+        self.target = np.zeros((len(trees), len(models)))
+        self.target[np.arange(len(trees)), [target for target, _ in trees]] = 1
+        self.baseline = np.array([float(np.ravel(model._baseline_prediction)[0]) for model in models])
+
+    def predict(self, X):
+        """Prakiraan (baris x model), setara model.predict(X) per model."""
+        rows = np.arange(len(X))[:, None]
+        node = np.broadcast_to(self.offset, (len(X), len(self.offset)))
+        while True:
+            leaf = self.is_leaf[node]
+            if leaf.all():
+                break
+            values = X[rows, self.feature_idx[node]]
+            go_left = np.where(np.isnan(values), self.missing_go_to_left[node], values <= self.num_threshold[node])
+            child = np.where(go_left, self.left[node], self.right[node]) + self.offset
+            node = np.where(leaf, node, child)
+        return np.exp(self.value[node] @ self.target + self.baseline)
+
+
+class DemandForecaster:
+    """Model prakiraan casual dan registered per jam; cnt = casual + registered."""
+
+    def __init__(self, features=FEATURES, params=None):
+        self.features = tuple(features)
+        self.params = {**DEFAULT_PARAMS, **(params or {})}
+        self.models = None
+        self.compiled = None
+
+    def fit(self, hour_data):
+        X = _matrix(hour_data, self.features)
+        self.models = [HistGradientBoostingRegressor(**self.params).fit(X, np.asarray(hour_data[target]))
+                       for target in TARGETS]
+        self.compiled = self._compile(X[::max(1, len(X) // COMPILE_CHECK_ROWS)][:COMPILE_CHECK_ROWS])
+        return self
+
+    def _compile(self, sample):
+        # Pohon numpy hanya dipakai jika hasilnya sama dengan predict() sklearn versi terpasang
+        try:
+            compiled = _CompiledTrees(self.models)
+            matches = np.allclose(compiled.predict(sample), self._predict_sklearn(sample), rtol=1e-9, atol=1e-9)
+        except (AttributeError, KeyError, IndexError, TypeError, ValueError):
+            return None
+        return compiled if matches else None
+
+    def _predict_sklearn(self, X):
+        return np.column_stack([model.predict(X) for model in self.models])
+
+    def predict_matrix(self, X):
+        """Prakiraan (baris x OUTPUTS) untuk matriks fitur berurutan seperti self.features."""
+        if self.models is None:
+            raise ValueError("model belum dilatih (panggil fit atau load_forecaster)")
+        X = np.asarray(X, dtype=np.float64)
+        if len(X) <= SMALL_BATCH and self.compiled is not None:
+            targets = self.compiled.predict(X)
+        else:
+            targets = self._predict_sklearn(X)
+        return np.column_stack([targets, targets.sum(axis=1)])
+
+    def predict(self, frame):
+        """Prakiraan casual, registered dan cnt untuk setiap baris jam di frame (vektor)."""
+        return pd.DataFrame(self.predict_matrix(_matrix(frame, self.features)), index=frame.index,
+                            columns=list(OUTPUTS))
+
+    def score(self, **features):
+        """Prakiraan satu jam, misalnya score(hr=8, weekday=1, ..., mnth=6) -> {'casual': ..., 'cnt': ...}."""
+        missing = [feature for feature in self.features if feature not in features]
+        if missing:
+            raise ValueError(f"fitur prakiraan tidak ada: {missing}")
+        row = np.array([[features[feature] for feature in self.features]], dtype=np.float64)
+        return dict(zip(OUTPUTS, self.predict_matrix(row)[0].tolist()))
+
+
+def model_key(version, features=FEATURES, params=None):
+    """Kunci file model: versi data, fitur, parameter pelatihan dan versi scikit-learn."""
+    payload = {'version': version, 'features': list(features), 'params': {**DEFAULT_PARAMS, **(params or {})},
+               'sklearn': sklearn.__version__}
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def load_forecaster(hour_data=None, version=None, features=FEATURES, params=None, model_dir=MODEL_DIR):
+    """Model dari cache disk untuk versi data ini; dilatih dan disimpan jika belum ada.
+
+    hour_data hanya boleh diberikan bersama version-nya: tanpa itu model yang
+    dilatih dari hour_data akan disimpan di bawah versi data di disk.
+    """
+    if version is None:
+        if hour_data is not None:
+            raise ValueError("hour_data harus diberikan bersama version-nya")
+        version = data_version()
+    path = os.path.join(model_dir, f'forecast-{model_key(version, features, params)}.pkl')
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+        pass
+    if hour_data is None:
+        _, hour_data = load_frames()
+    forecaster = DemandForecaster(features, params).fit(hour_data)
+    os.makedirs(model_dir, exist_ok=True)
+    # Staging per penulis: beberapa proses bisa melatih model yang sama bersamaan
+    handle, staging = tempfile.mkstemp(dir=model_dir, prefix=f'.{os.path.basename(path)}.', suffix='.tmp')
+    try:
+        # mkstemp membuat file 0600; model harus bisa dibaca proses lain
+        os.chmod(staging, 0o644)
+        with os.fdopen(handle, 'wb') as f:
+            pickle.dump(forecaster, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(staging, path)
+    except BaseException:
+        if os.path.exists(staging):
+            os.unlink(staging)
+        raise
+    return forecaster
+
+
+def accuracy(actual, predicted):
+    """MAE, RMSE dan RMSLE (metrik umum data bike sharing) per kolom OUTPUTS."""
+    metrics = {}
+    for column in OUTPUTS:
+        error = predicted[column].to_numpy() - actual[column].to_numpy()
+        log_error = np.log1p(predicted[column].to_numpy()) - np.log1p(actual[column].to_numpy())
+        metrics[column] = {'mae': float(np.abs(error).mean()), 'rmse': float(np.sqrt(np.mean(error ** 2))),
+                           'rmsle': float(np.sqrt(np.mean(log_error ** 2)))}
+    return metrics
+
+
+def naive_forecast(train, test, weeks=4):
+    """Pembanding: rata-rata per (workingday, hr) dari `weeks` minggu terakhir data latih."""
+    recent = train[train['dteday'] >= train['dteday'].max() - pd.Timedelta(weeks=weeks)]
+    means = recent.groupby(['workingday', 'hr'])[list(TARGETS)].mean()
+    keys = pd.MultiIndex.from_arrays([test['workingday'], test['hr']])
+    predicted = means.reindex(keys).fillna(means.mean()).set_axis(test.index)
+    return predicted.assign(cnt=predicted.sum(axis=1))
+
+
+def backtest(hour_data, folds=6, horizon_days=30, features=FEATURES, params=None, latency_samples=200):
+    """Backtest rolling-origin: setiap fold dilatih pada semua jam sebelum titik awal, lalu
+    memprakirakan `horizon_days` hari berikutnya; fold terakhir berakhir di akhir data.
+
+    Hasilnya deterministik untuk data dan parameter yang sama (kecuali angka waktu).
+    """
+    hour_data = pd.DataFrame({column: np.asarray(hour_data[column])
+                              for column in dict.fromkeys(('dteday', *features, *OUTPUTS))})
+    end = hour_data['dteday'].max() + pd.Timedelta(days=1)
+    starts = [end - pd.Timedelta(days=horizon_days * (folds - fold)) for fold in range(folds)]
+    if starts[0] <= hour_data['dteday'].min():
+        raise ValueError("data terlalu pendek untuk jumlah fold dan horizon ini")
+
+    results, predictions, naive_predictions = [], [], []
+    fit_seconds = predict_seconds = 0.0
+    for start in starts:
+        train = hour_data[hour_data['dteday'] < start]
+        test = hour_data[(hour_data['dteday'] >= start) & (hour_data['dteday'] < start + pd.Timedelta(days=horizon_days))]
+        began = time.perf_counter()
+        forecaster = DemandForecaster(features, params).fit(train)
+        fit_seconds += time.perf_counter() - began
+        began = time.perf_counter()
+        predicted = forecaster.predict(test)
+        predict_seconds += time.perf_counter() - began
+        naive = naive_forecast(train, test)
+        predictions.append(predicted)
+        naive_predictions.append(naive)
+        results.append({'start': str(start.date()), 'train_rows': len(train), 'test_rows': len(test),
+                        'model': accuracy(test, predicted), 'naive': accuracy(test, naive)})
+
+    predicted = pd.concat(predictions)
+    tested = hour_data.loc[predicted.index]
+    errors = (predicted['cnt'] - tested['cnt']).abs()
+
+    # Latensi satu jam lewat score(), memakai model fold terakhir
+    rows = test.iloc[:latency_samples]
+    latencies = []
+    for row in rows[list(features)].to_dict('records'):
+        began = time.perf_counter()
+        forecaster.score(**row)
+        latencies.append(time.perf_counter() - began)
+
+    return {
+        'features': list(features),
+        'params': {**DEFAULT_PARAMS, **(params or {})},
+        'horizon_days': horizon_days,
+        'folds': results,
+        'overall': {'model': accuracy(tested, predicted), 'naive': accuracy(tested, pd.concat(naive_predictions))},
+        'cnt_mae_by_weathersit': errors.groupby(tested['weathersit']).mean().round(2).to_dict(),
+        'cnt_mae_by_season': errors.groupby(tested['season']).mean().round(2).to_dict(),
+        'throughput': {
+            'fit_seconds': fit_seconds,
+            'batch_predictions_per_second': len(predicted) / predict_seconds,
+            'score_latency_ms_p50': float(np.median(latencies) * 1000),
+            'score_latency_ms_p95': float(np.percentile(latencies, 95) * 1000),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memprakirakan casual, registered dan cnt untuk jam-jam di file CSV.")
+    parser.add_argument('path', help="CSV berisi kolom fitur: " + ", ".join(FEATURES))
+    parser.add_argument('--output', help="CSV keluaran (bawaan: cetak ke layar)")
+    args = parser.parse_args()
+
+    hours = pd.read_csv(args.path)
+    start = time.perf_counter()
+    predicted = load_forecaster().predict(hours)
+    seconds = time.perf_counter() - start
+    result = pd.concat([hours, predicted.round(1)], axis=1)
+    if args.output:
+        result.to_csv(args.output, index=False)
+        print(f'{len(result)} jam -> {args.output} ({seconds:.2f}s termasuk memuat/melatih model)')
+    else:
+        print(result.to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
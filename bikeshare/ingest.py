@@ -0,0 +1,412 @@
+"""Ingest data per jam secara append-only, tanpa menulis ulang hour.csv.
+
+Batch baru divalidasi terhadap skema di datasets/Readme.txt lalu disimpan
+sebagai segmen kolumnar (datasets/ingest/hour/<nomor>/). State turunan
+diperbarui hanya dari baris baru:
+
+- rollup harian setara day.csv (jumlah peminjaman dijumlahkan, cuaca
+  dirata-rata, weathersit = pembulatan rata-rata kode per jam);
+- statistik z-score cnt (RunningMoments yang digabung per batch);
+- kubus agregasi panel dashboard (kubus batch dijumlahkan ke kubus lama);
+- sketch korelasi kolom cuaca dan cnt (CorrelationSketch yang digabung per batch).
+
+Kubus tanpa outlier bergantung pada rata-rata dan simpangan seluruh data.
+Baris dengan cnt di luar rentang "guard" (z > TAIL_Z, lebih sempit dari
+ambang) disimpan terpisah sebagai ekor; selama guard masih di dalam ambang,
+kubus bersih = kubus penuh dikurangi baris ekor yang melewati ambang, tanpa
+membaca ulang histori. Sketch korelasi tanpa outlier dihitung dengan cara yang
+sama.
+
+Watermark (dteday, hr) terakhir disimpan di state, sehingga menjalankan ulang
+ingest atas file yang sama hanya mengambil baris yang lebih baru.
+
+    python -m bikeshare.ingest data_baru.csv
+"""
+import argparse
+import copy
+import json
+import os
+import pickle
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from bikeshare import store
+from bikeshare.correlation import CORRELATION_COLUMNS, correlation_sketch
+from bikeshare.cube import DIMENSIONS, MEASURES, build_cube, merge_cubes, subtract_cube
+from bikeshare.outliers import DEFAULT_THRESHOLDS, RunningMoments
+from bikeshare.store import CACHE_DIR, COLUMN_DTYPES, DATASET_DIR, MANIFEST, open_table, write_table
+
+INGEST_DIR = os.path.join(DATASET_DIR, 'ingest')
+STATE_FILE = 'state.pkl'
+SEGMENT_DIR = 'hour'
+DAY_TABLE = 'day'
+
+# Kolom wajib pada batch; instant diberikan ulang secara berurutan saat ingest
+REQUIRED_COLUMNS = tuple(column for column in COLUMN_DTYPES if column != 'instant')
+DAY_COLUMNS = tuple(column for column in COLUMN_DTYPES if column != 'hr')
+
+# Rentang kode menurut datasets/Readme.txt
+CODE_RANGES = {
+    'season': (1, 4),
+    'mnth': (1, 12),
+    'hr': (0, 23),
+    'holiday': (0, 1),
+    'weekday': (0, 6),
+    'workingday': (0, 1),
+    'weathersit': (1, 4),
+}
+NORMALIZED_COLUMNS = ('temp', 'atemp', 'hum', 'windspeed')
+COUNT_COLUMNS = ('casual', 'registered', 'cnt')
+CALENDAR_COLUMNS = ('season', 'yr', 'mnth', 'holiday', 'weekday', 'workingday')
+FIRST_YEAR = 2011
+
+# Kolom baris ekor: cukup untuk kubus dan sketch korelasi tanpa outlier
+TAIL_COLUMNS = tuple(dict.fromkeys((*DIMENSIONS, *MEASURES, *CORRELATION_COLUMNS)))
+
+# Batas z-score untuk baris ekor; harus lebih kecil dari ambang yang dipakai dashboard
+TAIL_Z = 2.5
+
+
+def _hour_key(dteday, hr):
+    """Kunci urut (jam sejak epoch) untuk pasangan dteday, hr."""
+    days = np.asarray(dteday, dtype='datetime64[D]').astype(np.int64)
+    return days * 24 + np.asarray(hr, dtype=np.int64)
+
+
+def validate_hours(frame):
+    """Memeriksa batch terhadap skema Readme dan mengembalikannya bertipe ringkas, urut (dteday, hr).
+
+    Semua pelanggaran dikumpulkan lalu dilaporkan sekaligus sebagai ValueError.
+    """
+    missing = [column for column in REQUIRED_COLUMNS if column not in frame.columns]
+    if missing:
+        raise ValueError(f"kolom wajib tidak ada: {missing}")
+    empty = [column for column in REQUIRED_COLUMNS if frame[column].isna().any()]
+    if empty:
+        raise ValueError(f"kolom berisi nilai kosong: {empty}")
+
+    dteday = pd.to_datetime(frame['dteday'], errors='coerce')
+    if dteday.isna().any():
+        raise ValueError(f"dteday tidak valid pada {int(dteday.isna().sum())} baris")
+    columns = {'dteday': dteday.to_numpy().astype(COLUMN_DTYPES['dteday'])}
+    for column in REQUIRED_COLUMNS[1:]:
+        values = pd.to_numeric(frame[column], errors='coerce').to_numpy(dtype=np.float64)
+        if np.isnan(values).any():
+            raise ValueError(f"kolom {column} harus numerik")
+        columns[column] = values
+
+    dates = pd.DatetimeIndex(columns['dteday'])
+    checks = {
+        f'{column} di luar {low}..{high}': (columns[column] < low) | (columns[column] > high)
+        for column, (low, high) in CODE_RANGES.items()
+    }
+    for column in (*CODE_RANGES, 'yr', *COUNT_COLUMNS):
+        checks[f'{column} bukan bilangan bulat'] = columns[column] != np.round(columns[column])
+    checks.update({
+        f'{column} di luar 0..1': (columns[column] < 0) | (columns[column] > 1)
+        for column in NORMALIZED_COLUMNS
+    })
+    checks.update({
+        f'{column} negatif': columns[column] < 0 for column in COUNT_COLUMNS
+    })
+    checks.update({
+        f'yr tidak sama dengan tahun dteday - {FIRST_YEAR}':
+            columns['yr'] != dates.year.to_numpy() - FIRST_YEAR,
+        'mnth tidak sama dengan bulan dteday': columns['mnth'] != dates.month.to_numpy(),
+        'weekday tidak sesuai dteday (0 = Minggu)': columns['weekday'] != (dates.dayofweek.to_numpy() + 1) % 7,
+        'workingday tidak sesuai weekday/holiday':
+            columns['workingday'] != (~np.isin(columns['weekday'], (0, 6)) & (columns['holiday'] == 0)),
+        'cnt tidak sama dengan casual + registered':
+            columns['cnt'] != columns['casual'] + columns['registered'],
+        'duplikat (dteday, hr)': pd.Series(_hour_key(columns['dteday'], columns['hr'])).duplicated().to_numpy(),
+    })
+    problems = [
+        f"{name}: {int(bad.sum())} baris (mis. baris {np.flatnonzero(bad)[:5].tolist()})"
+        for name, bad in checks.items() if bad.any()
+    ]
+    if problems:
+        raise ValueError("batch tidak sesuai skema:\n  " + "\n  ".join(problems))
+
+    validated = pd.DataFrame({
+        column: columns[column].astype(COLUMN_DTYPES[column]) for column in REQUIRED_COLUMNS
+    })
+    order = np.argsort(_hour_key(validated['dteday'], validated['hr']), kind='stable')
+    return validated.iloc[order].reset_index(drop=True)
+
+
+def _day_sums(hour_data):
+    """Jumlah per tanggal yang dibutuhkan rollup harian (bisa dijumlahkan antar batch)."""
+    sums = pd.DataFrame({
+        'dteday': hour_data['dteday'].to_numpy(),
+        'hours': np.ones(len(hour_data), dtype=np.int64),
+        'weathersit': hour_data['weathersit'].to_numpy(dtype=np.float64),
+        **{column: hour_data[column].to_numpy(dtype=np.float64) for column in NORMALIZED_COLUMNS},
+        **{column: hour_data[column].to_numpy(dtype=np.int64) for column in COUNT_COLUMNS},
+    })
+    grouped = sums.groupby('dteday', sort=True)
+    calendar = pd.DataFrame({column: hour_data[column].to_numpy() for column in CALENDAR_COLUMNS})
+    calendar['dteday'] = sums['dteday']
+    return pd.concat([grouped.sum(), calendar.groupby('dteday', sort=True).first()], axis=1)
+
+
+def _merge_day_sums(previous, new):
+    """Menggabungkan jumlah harian; hanya tanggal terakhir `previous` yang bisa tumpang tindih."""
+    if previous is None or not len(previous):
+        return new
+    overlap = previous.index[-1:].intersection(new.index)
+    if not len(overlap):
+        return pd.concat([previous, new])
+    last = pd.concat([previous.iloc[-1:], new.loc[overlap]])
+    sums = [column for column in last.columns if column not in CALENDAR_COLUMNS]
+    merged = last[sums].groupby(level=0).sum().join(last[list(CALENDAR_COLUMNS)].iloc[:1])
+    return pd.concat([previous.iloc[:-1], merged[previous.columns], new.drop(overlap)])
+
+
+class HourlyIngest:
+    """State ingest append-only beserta lokasi penyimpanannya.
+
+    HourlyIngest.open() memuat state yang tersimpan (atau membangunnya dari
+    data dasar bila belum ada atau hour.csv/day.csv berubah), append(batch)
+    menambahkan baris baru dan langsung menyimpannya.
+    """
+
+    def __init__(self, ingest_dir=INGEST_DIR, dataset_dir=DATASET_DIR, cache_dir=CACHE_DIR):
+        self.ingest_dir = ingest_dir
+        self.dataset_dir = dataset_dir
+        self.cache_dir = cache_dir
+        self.base_version = None
+        self.segments = 0
+        self.watermark = None
+        self.last_instant = 0
+        self.first_day_instant = 1
+        self.moments = RunningMoments()
+        self.guards = None
+        self.cube = None
+        self.correlation = None
+        self.tail = None
+        self.day_sums = None
+
+    # Penyimpanan
+
+    @property
+    def state_path(self):
+        return os.path.join(self.ingest_dir, STATE_FILE)
+
+    @property
+    def segment_dir(self):
+        return os.path.join(self.ingest_dir, SEGMENT_DIR)
+
+    @classmethod
+    def open(cls, ingest_dir=INGEST_DIR, dataset_dir=DATASET_DIR, cache_dir=CACHE_DIR):
+        ingest = cls(ingest_dir, dataset_dir, cache_dir)
+        try:
+            with open(ingest.state_path, 'rb') as f:
+                ingest.__dict__.update(pickle.load(f))
+        except (OSError, EOFError, pickle.UnpicklingError):
+            pass
+        # State dari versi lama tanpa sketch korelasi juga dibangun ulang
+        if ingest.base_version != store.data_version(dataset_dir) or ingest.correlation is None:
+            ingest._rebuild()
+        return ingest
+
+    def save(self):
+        os.makedirs(self.ingest_dir, exist_ok=True)
+        write_table(DAY_TABLE, self.day_rollup(), self.ingest_dir,
+                    source={'segments': self.segments, 'watermark': str(self.watermark)})
+        state = {key: value for key, value in self.__dict__.items()
+                 if key not in ('ingest_dir', 'dataset_dir', 'cache_dir')}
+        # Staging per penulis: beberapa proses/thread bisa membangun ulang state bersamaan
+        handle, staging = tempfile.mkstemp(dir=self.ingest_dir, prefix=f'.{STATE_FILE}.', suffix='.tmp')
+        try:
+            # mkstemp membuat file 0600; state harus bisa dibaca proses lain
+            os.chmod(staging, 0o644)
+            with os.fdopen(handle, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(staging, self.state_path)
+        except BaseException:
+            if os.path.exists(staging):
+                os.unlink(staging)
+            raise
+
+    def segment_names(self):
+        return [f'{number:06d}' for number in range(1, self.segments + 1)]
+
+    def ingested_hours(self):
+        """Baris jam yang sudah di-ingest (memory-map per segmen)."""
+        return [open_table(name, self.segment_dir) for name in self.segment_names()]
+
+    def _discard_orphans(self):
+        # Segmen yang tertulis tetapi state-nya gagal disimpan tidak pernah terhitung
+        if not os.path.isdir(self.segment_dir):
+            return
+        known = set(self.segment_names())
+        for name in os.listdir(self.segment_dir):
+            if name not in known:
+                shutil.rmtree(os.path.join(self.segment_dir, name), ignore_errors=True)
+
+    # Pembaruan state
+
+    def _bootstrap(self, hour_data, day_data):
+        """Satu lintasan atas data dasar; dilakukan sekali atau ketika CSV dasar berubah."""
+        self.base_version = store.data_version(self.dataset_dir)
+        self.moments = RunningMoments().update(hour_data['cnt'].to_numpy())
+        self._set_guards(TAIL_Z)
+        self.cube = build_cube(hour_data)
+        self.correlation = correlation_sketch(hour_data)
+        self.tail = self._tail_rows(hour_data)
+        last_date = hour_data['dteday'].to_numpy().max()
+        self.day_sums = _day_sums(hour_data[hour_data['dteday'].to_numpy() == last_date])
+        self.day_sums['new_hours'] = 0
+        self.first_day_instant = int(day_data['instant'].to_numpy()[day_data['dteday'].to_numpy() == last_date][0])
+        keys = _hour_key(hour_data['dteday'], hour_data['hr'])
+        self.watermark = int(keys.max())
+        self.last_instant = int(hour_data['instant'].to_numpy().max())
+
+    def _rebuild(self):
+        day_data, hour_data = store.load_frames(self.dataset_dir, self.cache_dir)
+        replay = self.ingested_hours()
+        self._bootstrap(hour_data, day_data)
+        for segment in replay:
+            self._apply(self._new_rows(segment))
+            self.last_instant = max(self.last_instant, int(segment['instant'].to_numpy().max()))
+        if replay:
+            self.save()
+
+    def _set_guards(self, z):
+        mean, std = self.moments.mean[0], self.moments.std()[0]
+        self.guards = (mean - z * std, mean + z * std)
+
+    def _tail_rows(self, hour_data):
+        cnt = hour_data['cnt'].to_numpy()
+        outside = (cnt < self.guards[0]) | (cnt > self.guards[1])
+        return pd.DataFrame({column: hour_data[column].to_numpy()[outside]
+                             for column in TAIL_COLUMNS})
+
+    def _new_rows(self, batch):
+        """Baris batch yang lebih baru dari watermark."""
+        keys = _hour_key(batch['dteday'], batch['hr'])
+        return batch[keys > self.watermark].reset_index(drop=True)
+
+    def _apply(self, batch):
+        if not len(batch):
+            return
+        self.moments.update(batch['cnt'].to_numpy())
+        self.cube = merge_cubes(self.cube, build_cube(batch))
+        self.correlation.update(batch)
+        self.tail = pd.concat([self.tail, self._tail_rows(batch)], ignore_index=True)
+        new_sums = _day_sums(batch)
+        new_sums['new_hours'] = new_sums['hours']
+        self.day_sums = _merge_day_sums(self.day_sums, new_sums)
+        self.watermark = int(_hour_key(batch['dteday'], batch['hr']).max())
+
+    def append(self, batch):
+        """Memvalidasi dan menambahkan batch; mengembalikan baris yang benar-benar baru."""
+        rows = self._new_rows(validate_hours(batch))
+        if not len(rows):
+            return rows
+        rows.insert(0, 'instant', np.arange(self.last_instant + 1, self.last_instant + 1 + len(rows),
+                                            dtype=COLUMN_DTYPES['instant']))
+        self._discard_orphans()
+        write_table(f'{self.segments + 1:06d}', rows, self.segment_dir)
+        self._apply(rows)
+        self.last_instant += len(rows)
+        self.segments += 1
+        self.save()
+        return rows
+
+    # Hasil turunan
+
+    def _outliers(self, threshold):
+        """Baris dengan z-score cnt > threshold, dari ekor (dipilih ulang bila ambang lebih sempit dari guard)."""
+        if (self.moments.scores(np.array(self.guards)) > threshold).any():
+            # Ambang lebih sempit dari guard: ekor dipilih ulang dari seluruh histori
+            self._set_guards(min(TAIL_Z, 0.8 * threshold))
+            _, hour_data = store.load_frames(self.dataset_dir, self.cache_dir)
+            self.tail = pd.concat([self._tail_rows(part) for part in (hour_data, *self.ingested_hours())],
+                                  ignore_index=True)
+        return self.tail[self.moments.scores(self.tail['cnt'].to_numpy()) > threshold]
+
+    def cleaned_cube(self, threshold=DEFAULT_THRESHOLDS['zscore']):
+        """Kubus tanpa outlier z-score cnt, setara build_cube(hour_data[outlier_mask(...)])."""
+        return subtract_cube(self.cube, build_cube(self._outliers(threshold)))
+
+    def cleaned_correlation(self, threshold=DEFAULT_THRESHOLDS['zscore']):
+        """Sketch korelasi tanpa outlier z-score cnt; state ingest sendiri tidak berubah."""
+        outliers = correlation_sketch(self._outliers(threshold), self.correlation.columns)
+        return copy.deepcopy(self.correlation).subtract(outliers)
+
+    def day_rollup(self):
+        """Baris day.csv untuk tanggal yang mendapat data baru (hari terakhir bisa belum lengkap)."""
+        sums = self.day_sums[self.day_sums['new_hours'] > 0]
+        instants = self.first_day_instant + np.flatnonzero(self.day_sums['new_hours'].to_numpy() > 0)
+        hours = sums['hours'].to_numpy()
+        day = {'instant': instants, 'dteday': sums.index.to_numpy()}
+        day.update({column: sums[column].to_numpy() for column in CALENDAR_COLUMNS})
+        day['weathersit'] = np.rint(sums['weathersit'].to_numpy() / hours)
+        day.update({column: sums[column].to_numpy() / hours for column in NORMALIZED_COLUMNS})
+        day.update({column: sums[column].to_numpy() for column in COUNT_COLUMNS})
+        return pd.DataFrame({column: np.asarray(day[column]).astype(COLUMN_DTYPES[column])
+                             for column in DAY_COLUMNS})
+
+
+def ingested_segments(ingest_dir=INGEST_DIR):
+    """Jumlah batch yang sudah di-ingest (0 jika belum pernah)."""
+    try:
+        with open(os.path.join(ingest_dir, DAY_TABLE, MANIFEST)) as f:
+            return json.load(f)['source']['segments']
+    except (OSError, ValueError, KeyError, TypeError):
+        return 0
+
+
+def _ingested_tables(ingest_dir):
+    """(day_rollup, segmen jam) dari penyimpanan ingest, atau None jika belum ada ingest."""
+    segments = ingested_segments(ingest_dir)
+    if not segments:
+        return None
+    hours = [open_table(f'{number:06d}', os.path.join(ingest_dir, SEGMENT_DIR))
+             for number in range(1, segments + 1)]
+    return open_table(DAY_TABLE, ingest_dir), hours
+
+
+def data_version(dataset_dir=DATASET_DIR, ingest_dir=INGEST_DIR):
+    """store.data_version() ditambah penanda batch ingest terakhir."""
+    try:
+        stamp = os.stat(os.path.join(ingest_dir, DAY_TABLE, MANIFEST)).st_mtime_ns
+    except OSError:
+        stamp = None
+    return store.data_version(dataset_dir) + (('ingest', stamp),)
+
+
+def load_frames(dataset_dir=DATASET_DIR, cache_dir=CACHE_DIR, ingest_dir=INGEST_DIR):
+    """(day_data, hour_data) dari data dasar ditambah batch yang sudah di-ingest.
+
+    Tanpa ingest, hasilnya sama persis dengan store.load_frames() (tetap memory-map).
+    """
+    day_data, hour_data = store.load_frames(dataset_dir, cache_dir)
+    ingested = _ingested_tables(ingest_dir)
+    if ingested is None:
+        return day_data, hour_data
+    day_rollup, hours = ingested
+    hour_data = pd.concat([hour_data, *hours], ignore_index=True)
+    # Rollup menggantikan baris day.csv untuk tanggal yang sama (hari terakhir data dasar)
+    older = day_data['dteday'].to_numpy() < day_rollup['dteday'].to_numpy()[0]
+    day_data = pd.concat([day_data[older], day_rollup], ignore_index=True)
+    return day_data, hour_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Menambahkan data per jam baru dari file CSV.")
+    parser.add_argument('paths', nargs='+', help='file CSV berskema hour.csv')
+    args = parser.parse_args()
+
+    ingest = HourlyIngest.open()
+    for path in args.paths:
+        rows = ingest.append(pd.read_csv(path))
+        print(f'{path}: {len(rows)} baris baru, watermark {np.datetime64(ingest.watermark, "h")}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+"""Filter outlier bertahap (per potongan data) tanpa menyalin frame.
+
+Statistik dikumpulkan dalam satu lintasan dan bisa digabung antar potongan:
+
+* RunningMoments: mean/varians metode Welford (digabung dengan rumus Chan)
+  untuk z-score biasa.
+* CountHistogram: histogram nilai integer non-negatif (cnt, casual,
+  registered) untuk median/MAD yang eksak dan tahan terhadap outlier.
+
+Keduanya mendukung ambang per kelompok (misalnya per hr atau per season)
+dengan memberikan kode kelompok integer. Hasil akhirnya berupa mask boolean
+(True = baris dipertahankan), bukan salinan frame.
+"""
+import numpy as np
+import pandas as pd
+
+METHODS = ('zscore', 'mad')
+DEFAULT_THRESHOLDS = {'zscore': 3.0, 'mad': 3.5}
+DEFAULT_CHUNKSIZE = 1_000_000
+
+# Konstanta skor-z termodifikasi (Iglewicz & Hoaglin)
+MAD_SCALE = 0.6745
+
+
+def _group_codes(groups, size):
+    if groups is None:
+        return np.zeros(size, dtype=np.intp)
+    codes = np.asarray(groups, dtype=np.intp)
+    if len(codes) and codes.min() < 0:
+        raise ValueError("kode kelompok harus integer non-negatif")
+    return codes
+
+
+def _grow(array, length, axis=0):
+    if array.shape[axis] >= length:
+        return array
+    pad = [(0, 0)] * array.ndim
+    pad[axis] = (0, length - array.shape[axis])
+    return np.pad(array, pad)
+
+
+class RunningMoments:
+    """Jumlah, rata-rata dan M2 per kelompok, diperbarui per potongan data."""
+
+    def __init__(self):
+        self.count = np.zeros(0, dtype=np.int64)
+        self.mean = np.zeros(0)
+        self.m2 = np.zeros(0)
+
+    def _resize(self, n_groups):
+        self.count = _grow(self.count, n_groups)
+        self.mean = _grow(self.mean, n_groups)
+        self.m2 = _grow(self.m2, n_groups)
+
+    def merge_moments(self, count, mean, m2):
+        self._resize(len(count))
+        count = _grow(count, len(self.count))
+        mean = _grow(mean, len(self.count))
+        m2 = _grow(m2, len(self.count))
+
+        total = self.count + count
+        safe_total = np.maximum(total, 1)
+        delta = mean - self.mean
+        self.mean = self.mean + delta * count / safe_total
+        self.m2 = self.m2 + m2 + delta ** 2 * self.count * count / safe_total
+        self.count = total
+        return self
+
+    def update(self, values, groups=None):
+        values = np.asarray(values, dtype=np.float64)
+        codes = _group_codes(groups, len(values))
+        if not len(values):
+            return self
+        n_groups = max(codes.max() + 1, len(self.count))
+        count = np.bincount(codes, minlength=n_groups)
+        mean = np.bincount(codes, weights=values, minlength=n_groups) / np.maximum(count, 1)
+        m2 = np.bincount(codes, weights=(values - mean[codes]) ** 2, minlength=n_groups)
+        return self.merge_moments(count, mean, m2)
+
+    def merge(self, other):
+        return self.merge_moments(other.count, other.mean, other.m2)
+
+    def variance(self, ddof=0):
+        return self.m2 / np.maximum(self.count - ddof, 1)
+
+    def std(self, ddof=0):
+        return np.sqrt(self.variance(ddof))
+
+    def scores(self, values, groups=None):
+        """|z| per nilai terhadap rata-rata dan simpangan baku (ddof=0) kelompoknya."""
+        values = np.asarray(values, dtype=np.float64)
+        codes = _group_codes(groups, len(values))
+        std = self.std()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.abs(values - self.mean[codes]) / std[codes]
+
+
+class CountHistogram:
+    """Histogram nilai integer non-negatif per kelompok untuk median dan MAD eksak."""
+
+    def __init__(self):
+        self.counts = np.zeros((0, 0), dtype=np.int64)
+
+    def update(self, values, groups=None):
+        values = np.asarray(values)
+        if values.dtype.kind == 'f' and not np.all(values == np.round(values)):
+            raise ValueError("CountHistogram hanya menerima nilai integer")
+        values = values.astype(np.intp)
+        if len(values) and values.min() < 0:
+            raise ValueError("CountHistogram hanya menerima nilai non-negatif")
+        codes = _group_codes(groups, len(values))
+        if not len(values):
+            return self
+        n_groups = max(codes.max() + 1, self.counts.shape[0])
+        width = max(values.max() + 1, self.counts.shape[1])
+        flat = np.bincount(codes * width + values, minlength=n_groups * width)
+        self.counts = _grow(_grow(self.counts, n_groups, axis=0), width, axis=1)
+        self.counts += flat.reshape(n_groups, width)
+        return self
+
+    def merge(self, other):
+        n_groups = max(self.counts.shape[0], other.counts.shape[0])
+        width = max(self.counts.shape[1], other.counts.shape[1])
+        self.counts = _grow(_grow(self.counts, n_groups, axis=0), width, axis=1)
+        self.counts += _grow(_grow(other.counts, n_groups, axis=0), width, axis=1)
+        return self
+
+    @staticmethod
+    def _weighted_median(values, weights):
+        order = np.argsort(values, kind='stable')
+        values = values[order]
+        cumulative = np.cumsum(weights[order])
+        total = cumulative[-1]
+        low = values[np.searchsorted(cumulative, (total - 1) // 2, side='right')]
+        high = values[np.searchsorted(cumulative, total // 2, side='right')]
+        return (low + high) / 2
+
+    def median_mad(self):
+        """Median dan MAD (median absolute deviation) untuk setiap kelompok."""
+        n_groups, width = self.counts.shape
+        median = np.full(n_groups, np.nan)
+        mad = np.full(n_groups, np.nan)
+        values = np.arange(width, dtype=np.float64)
+        for group in range(n_groups):
+            weights = self.counts[group]
+            if not weights.sum():
+                continue
+            median[group] = self._weighted_median(values, weights)
+            mad[group] = self._weighted_median(np.abs(values - median[group]), weights)
+        return median, mad
+
+    def scores(self, values, groups=None):
+        """|skor-z termodifikasi| = 0.6745 * |x - median| / MAD per kelompok."""
+        values = np.asarray(values, dtype=np.float64)
+        codes = _group_codes(groups, len(values))
+        median, mad = self.median_mad()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return MAD_SCALE * np.abs(values - median[codes]) / mad[codes]
+
+
+def iter_chunks(data, chunksize=DEFAULT_CHUNKSIZE):
+    """Potongan baris dari DataFrame; iterator potongan (misalnya dari read_csv) diteruskan apa adanya."""
+    if isinstance(data, pd.DataFrame):
+        for start in range(0, len(data), chunksize):
+            yield data.iloc[start:start + chunksize]
+    else:
+        yield from data
+
+
+def _group_values(chunk, by):
+    return None if by is None else chunk[by].to_numpy()
+
+
+def fit_outlier_stats(chunks, column='cnt', method='zscore', by=None):
+    """Mengumpulkan statistik outlier dari iterator potongan frame dalam satu lintasan."""
+    if method not in METHODS:
+        raise ValueError(f"method harus salah satu dari {METHODS}, bukan {method!r}")
+    accumulator = RunningMoments() if method == 'zscore' else CountHistogram()
+    for chunk in chunks:
+        accumulator.update(chunk[column].to_numpy(), _group_values(chunk, by))
+    return accumulator
+
+
+def keep_mask(accumulator, chunk, column='cnt', threshold=None, by=None):
+    """Mask baris yang bukan outlier pada satu potongan, berdasarkan statistik yang sudah dikumpulkan."""
+    if threshold is None:
+        method = 'zscore' if isinstance(accumulator, RunningMoments) else 'mad'
+        threshold = DEFAULT_THRESHOLDS[method]
+    scores = accumulator.scores(chunk[column].to_numpy(), _group_values(chunk, by))
+    # Skor NaN (simpangan nol dan nilai sama dengan pusat) tetap dipertahankan
+    return ~(scores > threshold)
+
+
+def outlier_mask(frame, column='cnt', method='zscore', threshold=None, by=None,
+                 chunksize=DEFAULT_CHUNKSIZE):
+    """Mask boolean untuk baris non-outlier di frame, diproses per potongan.
+
+    method='zscore' setara dengan np.abs(stats.zscore(frame[column])) <= threshold;
+    method='mad' memakai median/MAD. `by` adalah nama kolom kode kelompok
+    (misalnya 'hr' atau 'season') untuk ambang per kelompok.
+    """
+    accumulator = fit_outlier_stats(iter_chunks(frame, chunksize), column, method, by)
+    mask = np.empty(len(frame), dtype=bool)
+    for start in range(0, len(frame), chunksize):
+        chunk = frame.iloc[start:start + chunksize]
+        mask[start:start + len(chunk)] = keep_mask(accumulator, chunk, column, threshold, by)
+    return mask
@@ -0,0 +1,60 @@
+"""Segmentasi pengguna (K-Means) dengan model yang bisa disimpan dan dipakai ulang.
+
+Model dilatih sekali per kunci filter, lalu baris baru cukup diberi label
+dengan predict() terhadap centroid yang sudah ada. Untuk histori jam yang
+besar tersedia MiniBatchKMeans, termasuk pelatihan per potongan (partial_fit)
+untuk data yang tidak muat di memori.
+"""
+import numpy as np
+from sklearn.cluster import KMeans, MiniBatchKMeans
+
+FEATURES = ('hr', 'weathersit', 'cnt')
+MODES = ('auto', 'full', 'minibatch')
+
+# Di atas jumlah baris ini mode 'auto' memakai MiniBatchKMeans
+MINIBATCH_THRESHOLD = 200_000
+
+
+def _matrix(frame, features):
+    return frame[list(features)].to_numpy(dtype=np.float64)
+
+
+def fit_segments(frame, n_clusters=3, features=FEATURES, mode='auto', batch_size=4096, random_state=42):
+    """Melatih model segmentasi pada seluruh frame."""
+    if mode not in MODES:
+        raise ValueError(f"mode harus salah satu dari {MODES}, bukan {mode!r}")
+    X = _matrix(frame, features)
+    if mode == 'auto':
+        mode = 'minibatch' if len(X) > MINIBATCH_THRESHOLD else 'full'
+    if mode == 'full':
+        model = KMeans(n_clusters=n_clusters, random_state=random_state)
+    else:
+        model = MiniBatchKMeans(n_clusters=n_clusters, batch_size=batch_size, n_init=3,
+                                random_state=random_state)
+    return model.fit(X)
+
+
+def fit_segments_streaming(chunks, n_clusters=3, features=FEATURES, batch_size=4096, random_state=42):
+    """Melatih MiniBatchKMeans secara bertahap dari iterator potongan frame."""
+    model = MiniBatchKMeans(n_clusters=n_clusters, batch_size=batch_size, n_init=3,
+                            random_state=random_state)
+    for chunk in chunks:
+        if len(chunk):
+            model.partial_fit(_matrix(chunk, features))
+    return model
+
+
+def update_segments(model, new_rows, features=FEATURES):
+    """Model setelah baris baru ditambahkan, tanpa melatih ulang seluruh histori.
+
+    MiniBatchKMeans digeser dengan partial_fit atas baris baru; KMeans penuh
+    mempertahankan centroid-nya, baris baru cukup diberi label dengan predict().
+    """
+    if isinstance(model, MiniBatchKMeans) and len(new_rows):
+        model.partial_fit(_matrix(new_rows, features))
+    return model
+
+
+def assign_segments(model, frame, features=FEATURES):
+    """Memberi label cluster pada baris frame memakai centroid model yang sudah dilatih."""
+    return model.predict(_matrix(frame, features))
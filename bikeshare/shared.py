@@ -0,0 +1,199 @@
+"""Lapisan data bersama (read-only) untuk mode server dengan banyak sesi.
+
+SharedCache menyimpan hasil komputasi sekali per proses untuk semua sesi:
+
+- hasil dibagikan tanpa salinan data: DataFrame/Series dikembalikan sebagai
+  salinan dangkal (copy-on-write pandas), sehingga perubahan di satu sesi
+  tidak pernah mengubah objek milik cache maupun sesi lain, dan array numpy
+  dikembalikan sebagai view read-only;
+- total ukuran hasil dibatasi anggaran memori (BIKESHARE_MEMORY_BUDGET_MB),
+  hasil yang paling lama tidak dipakai diusir lebih dulu (LRU);
+- setiap kunci dihitung sekali: sesi lain yang meminta kunci yang sama
+  menunggu hasil tersebut, tidak ikut menghitung.
+
+State per sesi cukup pilihan filter (st.session_state); data dan agregat
+tidak lagi disalin per sesi seperti pada st.cache_data.
+"""
+import functools
+import hashlib
+import inspect
+import logging
+import mmap
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Anggaran memori cache bersama (MB), bisa diatur lewat variabel lingkungan
+MEMORY_BUDGET_MB = float(os.environ.get('BIKESHARE_MEMORY_BUDGET_MB', 512))
+
+# pandas 3 selalu copy-on-write; versi sebelumnya perlu diaktifkan agar salinan dangkal aman
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+
+def _mapped(array):
+    # Array dari memory-map (cache .npy) dibaca dari page cache OS, bukan heap proses
+    while array is not None:
+        if isinstance(array, (np.memmap, mmap.mmap)):
+            return True
+        array = getattr(array, 'base', None)
+    return False
+
+
+def nbytes(value):
+    """Perkiraan ukuran hasil di heap (termasuk string object dan isi tuple/list/dict).
+
+    Kolom dan array yang di-memory-map tidak dihitung: datanya milik file
+    cache dan dibagi semua sesi (serta proses) lewat page cache OS.
+    """
+    if isinstance(value, pd.DataFrame):
+        usage = value.memory_usage(index=True, deep=True)
+        mapped = [position for position in range(value.shape[1])
+                  if _mapped(value.iloc[:, position].to_numpy(copy=False))]
+        return int(usage.sum() - usage.iloc[[position + 1 for position in mapped]].sum())
+    if isinstance(value, pd.Series):
+        return 0 if _mapped(value.to_numpy(copy=False)) else int(value.memory_usage(deep=True))
+    if isinstance(value, pd.Index):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return 0 if _mapped(value) else value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(nbytes(item) for item in value)
+    if isinstance(value, dict):
+        return sum(nbytes(item) for item in value.values())
+    return sys.getsizeof(value)
+
+
+def share(value):
+    """Tampilan hasil cache untuk satu pemanggil: tanpa menyalin data, tanpa bisa mengubah aslinya."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)
+    if isinstance(value, np.ndarray):
+        view = value.view()
+        view.flags.writeable = False
+        return view
+    if isinstance(value, tuple):
+        return tuple(share(item) for item in value)
+    if isinstance(value, list):
+        return [share(item) for item in value]
+    if isinstance(value, dict):
+        return {key: share(item) for key, item in value.items()}
+    return value
+
+
+def _code_digest(code, digest):
+    # Bytecode saja tidak cukup: literal, nama yang dipanggil dan lambda bersarang
+    # ada di co_consts/co_names, jadi ikut di-hash (rekursif untuk code object)
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if hasattr(const, 'co_code'):
+            _code_digest(const, digest)
+        else:
+            digest.update(repr(const).encode())
+    return digest
+
+
+def code_version(func):
+    """Hash kode fungsi asli (bukan pembungkus seperti timing.cached) untuk kunci cache."""
+    return _code_digest(inspect.unwrap(func).__code__, hashlib.sha1()).hexdigest()[:12]
+
+
+class SharedCache:
+    """Cache LRU lintas sesi dengan anggaran memori dalam byte."""
+
+    def __init__(self, budget_mb=MEMORY_BUDGET_MB):
+        self.budget = int(budget_mb * 2 ** 20)
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._pending = {}
+        # Nama hasil yang pernah melebihi anggaran (peringatan cukup sekali)
+        self._oversized = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_compute(self, key, compute):
+        while True:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return share(self._entries[key][0])
+                pending = self._pending.get(key)
+                if pending is None:
+                    pending = self._pending[key] = (threading.Event(), {})
+                    self.misses += 1
+                    break
+            # Kunci sedang dihitung sesi lain: hasilnya dipakai juga walaupun tidak muat di cache;
+            # hanya jika perhitungan itu gagal, kunci dihitung sendiri
+            event, result = pending
+            event.wait()
+            if 'value' in result:
+                with self._lock:
+                    self.hits += 1
+                return share(result['value'])
+        event, result = pending
+        try:
+            result['value'] = value = compute()
+            with self._lock:
+                self._store(key, value)
+        finally:
+            with self._lock:
+                del self._pending[key]
+            event.set()
+        return share(value)
+
+    def _store(self, key, value):
+        size = nbytes(value)
+        if size > self.budget:
+            # Lebih besar dari seluruh anggaran: dikembalikan tanpa disimpan
+            name = key[0] if isinstance(key, tuple) else key
+            if name in self._oversized:
+                return
+            self._oversized.add(name)
+            logger.warning("Hasil %s (%.0f MB) melebihi anggaran cache bersama (%.0f MB) dan tidak disimpan; "
+                           "naikkan BIKESHARE_MEMORY_BUDGET_MB", name, size / 2 ** 20, self.budget / 2 ** 20)
+            return
+        self._entries[key] = (value, size)
+        self.nbytes += size
+        while self.nbytes > self.budget:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.nbytes -= evicted
+            self.evictions += 1
+
+    def clear(self, prefix=None):
+        """Mengosongkan cache, atau hanya hasil fungsi `prefix` (nama dari __call__)."""
+        with self._lock:
+            for key in [key for key in self._entries if prefix is None or key[0] == prefix]:
+                self.nbytes -= self._entries.pop(key)[1]
+
+    def __call__(self, func):
+        """Dekorator: hasil func(*args) disimpan per argumen (harus hashable) dan versi kode func."""
+        name = f'{func.__module__}.{func.__qualname__}:{code_version(func)}'
+
+        @functools.wraps(func)
+        def memoized(*args, **kwargs):
+            key = (name, args, tuple(sorted(kwargs.items())))
+            return self.get_or_compute(key, lambda: func(*args, **kwargs))
+
+        memoized.clear = lambda: self.clear(name)
+        return memoized
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'mb': self.nbytes / 2 ** 20, 'budget_mb': self.budget / 2 ** 20,
+                    'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+
+SHARED_CACHE = SharedCache()
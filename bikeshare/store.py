@@ -0,0 +1,160 @@
+"""Penyimpanan kolumnar untuk datasets/day.csv dan datasets/hour.csv.
+
+Setiap kolom disimpan sebagai file .npy dengan tipe data ringkas lalu dibuka
+kembali dengan memory-map, sehingga CSV hanya diparsing ulang ketika cache
+sudah tidak sesuai dengan file sumbernya.
+"""
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+DATASET_DIR = 'datasets'
+CACHE_DIR = os.path.join(DATASET_DIR, 'cache')
+TABLES = ('day', 'hour')
+MANIFEST = 'manifest.json'
+
+# Tipe data ringkas untuk tiap kolom (lihat datasets/Readme.txt)
+COLUMN_DTYPES = {
+    'instant': np.int32,
+    'dteday': 'datetime64[s]',
+    'season': np.uint8,
+    'yr': np.uint8,
+    'mnth': np.uint8,
+    'hr': np.uint8,
+    'holiday': np.uint8,
+    'weekday': np.uint8,
+    'workingday': np.uint8,
+    'weathersit': np.uint8,
+    'temp': np.float32,
+    'atemp': np.float32,
+    'hum': np.float32,
+    'windspeed': np.float32,
+    'casual': np.int32,
+    'registered': np.int32,
+    'cnt': np.int32,
+}
+
+
+def csv_path(table, dataset_dir=DATASET_DIR):
+    return os.path.join(dataset_dir, f'{table}.csv')
+
+
+def _source_stamp(path):
+    info = os.stat(path)
+    return {'size': info.st_size, 'mtime_ns': info.st_mtime_ns}
+
+
+def data_version(dataset_dir=DATASET_DIR):
+    """Penanda versi CSV sumber, murah dihitung (hanya os.stat) untuk kunci cache."""
+    version = []
+    for table in TABLES:
+        stamp = _source_stamp(csv_path(table, dataset_dir))
+        version.append((table, stamp['size'], stamp['mtime_ns']))
+    return tuple(version)
+
+
+def read_csv(path):
+    """Membaca CSV mentah langsung ke tipe data ringkas."""
+    header = pd.read_csv(path, nrows=0).columns
+    dtypes = {c: COLUMN_DTYPES[c] for c in header if c in COLUMN_DTYPES and c != 'dteday'}
+    frame = pd.read_csv(path, dtype=dtypes, parse_dates=['dteday'])
+    frame['dteday'] = frame['dteday'].astype(COLUMN_DTYPES['dteday'])
+    return frame
+
+
+def is_stale(table, dataset_dir=DATASET_DIR, cache_dir=CACHE_DIR):
+    """True jika cache belum ada atau CSV sumber sudah berubah."""
+    try:
+        with open(os.path.join(cache_dir, table, MANIFEST)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return True
+    return manifest.get('source') != _source_stamp(csv_path(table, dataset_dir))
+
+
+def write_table(table, frame, cache_dir=CACHE_DIR, source=None):
+    """Menulis frame sebagai satu file .npy per kolom beserta manifest-nya.
+
+    Setiap penulis memakai direktori staging sendiri, sehingga dashboard dan
+    CLI yang membangun ulang cache bersamaan tidak saling menghapus atau
+    menerbitkan direktori setengah jadi milik penulis lain.
+    """
+    target = os.path.join(cache_dir, table)
+    os.makedirs(cache_dir, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=cache_dir, prefix=f'.{table}.', suffix='.tmp')
+    try:
+        # mkdtemp membuat direktori 0700; cache harus bisa dibaca proses lain
+        os.chmod(staging, 0o755)
+        for column in frame.columns:
+            np.save(os.path.join(staging, f'{column}.npy'), frame[column].to_numpy())
+        manifest = {'columns': list(frame.columns), 'rows': len(frame), 'source': source}
+        with open(os.path.join(staging, MANIFEST), 'w') as f:
+            json.dump(manifest, f)
+        _publish(staging, target)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def _publish(staging, target):
+    # Tabel lama dipindahkan ke samping dulu lalu dihapus; file yang sudah di-memory-map
+    # pembaca tetap valid sampai ditutup
+    retired = tempfile.mkdtemp(dir=os.path.dirname(target), prefix=f'.{os.path.basename(target)}.', suffix='.old')
+    try:
+        try:
+            os.replace(target, retired)
+        except FileNotFoundError:
+            pass
+        try:
+            os.replace(staging, target)
+        except OSError:
+            # Penulis lain menerbitkan tabel yang sama lebih dulu: hasilnya dipakai
+            if not os.path.isfile(os.path.join(target, MANIFEST)):
+                raise
+    finally:
+        shutil.rmtree(retired, ignore_errors=True)
+
+
+def build_table(table, dataset_dir=DATASET_DIR, cache_dir=CACHE_DIR):
+    """Mengonversi CSV sumber menjadi cache kolumnar."""
+    path = csv_path(table, dataset_dir)
+    source = _source_stamp(path)
+    frame = read_csv(path)
+    write_table(table, frame, cache_dir, source)
+    return frame
+
+
+def open_table(table, cache_dir=CACHE_DIR):
+    """Membuka tabel dari cache dengan memory-map (read-only, tanpa salinan)."""
+    folder = os.path.join(cache_dir, table)
+    with open(os.path.join(folder, MANIFEST)) as f:
+        manifest = json.load(f)
+    columns = {
+        column: np.load(os.path.join(folder, f'{column}.npy'), mmap_mode='r')
+        for column in manifest['columns']
+    }
+    return pd.DataFrame(columns, copy=False)
+
+
+def load_table(table, dataset_dir=DATASET_DIR, cache_dir=CACHE_DIR):
+    try:
+        if is_stale(table, dataset_dir, cache_dir):
+            build_table(table, dataset_dir, cache_dir)
+        return open_table(table, cache_dir)
+    except OSError:
+        # Cache tidak bisa ditulis, atau sedang diganti proses lain: gunakan CSV secara langsung
+        return read_csv(csv_path(table, dataset_dir))
+
+
+def load_frames(dataset_dir=DATASET_DIR, cache_dir=CACHE_DIR):
+    """Mengembalikan (day_data, hour_data) dari cache kolumnar."""
+    return tuple(load_table(table, dataset_dir, cache_dir) for table in TABLES)
+
+
+if __name__ == '__main__':
+    for name in TABLES:
+        built = build_table(name)
+        print(f'{name}: {len(built)} baris -> {os.path.join(CACHE_DIR, name)}')
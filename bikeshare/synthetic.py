@@ -0,0 +1,180 @@
+"""Data sintetis berskema hour.csv/day.csv untuk pengujian skala.
+
+Skala N berarti N stasiun fiktif yang masing-masing memakai kalender asli
+hour.csv (dteday, season, yr, mnth, hr, holiday, weekday, workingday), sehingga
+kode kategori tetap valid (misalnya yr hanya 0/1) sementara jumlah baris
+bertambah N kali. Cuaca dan jumlah peminjaman dibangkitkan ulang per stasiun
+dengan parameter yang dikalibrasi dari data asli:
+
+- weathersit mengikuti distribusi per bulan dan bertahan beberapa jam
+  (rantai segmen, bukan undian per jam yang saling lepas);
+- temp/atemp/hum/windspeed = nilai asli + derau, dibulatkan ke nilai unik
+  yang ada di data asli sehingga kardinalitasnya (penting untuk groupby) sama;
+- cnt ~ Poisson(profil jam x workingday x faktor bulan x faktor cuaca x
+  skala stasiun), lalu dipecah menjadi casual/registered secara binomial.
+"""
+import numpy as np
+import pandas as pd
+
+from bikeshare.store import COLUMN_DTYPES
+
+WEATHER_COLUMNS = ('temp', 'atemp', 'hum', 'windspeed')
+WEATHER_NOISE = {'temp': 0.03, 'atemp': 0.03, 'hum': 0.05, 'windspeed': 0.04}
+
+# Peluang cuaca berganti pada jam berikutnya (rata-rata cuaca bertahan ~6 jam)
+WEATHER_CHANGE_PROBABILITY = 1 / 6
+
+# Sebaran ukuran stasiun (lognormal, sigma)
+STATION_SPREAD = 0.25
+
+CALENDAR_COLUMNS = ('dteday', 'season', 'yr', 'mnth', 'hr', 'holiday', 'weekday', 'workingday')
+DAY_COLUMNS = ('instant', 'dteday', 'season', 'yr', 'mnth', 'holiday', 'weekday', 'workingday',
+               'weathersit', 'temp', 'atemp', 'hum', 'windspeed', 'casual', 'registered', 'cnt')
+
+
+def calibrate(hour_data):
+    """Parameter pembangkit yang diturunkan dari hour_data asli."""
+    workingday = hour_data['workingday'].to_numpy(dtype=np.int64)
+    hr = hour_data['hr'].to_numpy(dtype=np.int64)
+    month = hour_data['mnth'].to_numpy(dtype=np.int64) - 1
+    yr = hour_data['yr'].to_numpy(dtype=np.int64)
+    weathersit = hour_data['weathersit'].to_numpy(dtype=np.int64)
+    cnt = hour_data['cnt'].to_numpy(dtype=np.float64)
+    casual = hour_data['casual'].to_numpy(dtype=np.float64)
+
+    profile_key = workingday * 24 + hr
+    profile_cnt = np.bincount(profile_key, cnt, minlength=48)
+    profile = (profile_cnt / np.maximum(np.bincount(profile_key, minlength=48), 1)).reshape(2, 24)
+    casual_share = (np.bincount(profile_key, casual, minlength=48)
+                    / np.maximum(profile_cnt, 1)).reshape(2, 24)
+
+    # Faktor relatif terhadap yang diharapkan dari profil jam saja
+    expected = profile.ravel()[profile_key]
+    month_key = yr * 12 + month
+    month_factor = (np.bincount(month_key, cnt, minlength=24)
+                    / np.maximum(np.bincount(month_key, expected, minlength=24), 1e-9)).reshape(2, 12)
+    weather_factor = np.ones(5)
+    weather_sum = np.bincount(weathersit, cnt, minlength=5)
+    weather_expected = np.bincount(weathersit, expected * month_factor.ravel()[month_key], minlength=5)
+    present = weather_expected > 0
+    weather_factor[present] = weather_sum[present] / weather_expected[present]
+
+    weather_counts = np.zeros((12, 5))
+    np.add.at(weather_counts, (month, weathersit), 1)
+    weather_counts[:, 0] = 0
+    weather_probability = weather_counts / weather_counts.sum(axis=1, keepdims=True)
+
+    return {
+        'calendar': pd.DataFrame({column: hour_data[column].to_numpy() for column in CALENDAR_COLUMNS}),
+        'weather': {column: hour_data[column].to_numpy(dtype=np.float64) for column in WEATHER_COLUMNS},
+        'weather_values': {column: np.unique(hour_data[column].to_numpy(dtype=np.float64))
+                           for column in WEATHER_COLUMNS},
+        'profile': profile,
+        'casual_share': casual_share,
+        'month_factor': month_factor,
+        'weather_factor': weather_factor,
+        'weather_probability': weather_probability,
+    }
+
+
+def _snap(values, grid):
+    """Membulatkan setiap nilai ke anggota grid (terurut) yang terdekat."""
+    position = np.clip(np.searchsorted(grid, values), 1, len(grid) - 1)
+    left, right = grid[position - 1], grid[position]
+    return np.where(values - left <= right - values, left, right)
+
+
+def _weathersit(params, month, rng):
+    """weathersit per jam: segmen cuaca yang panjangnya acak, kodenya diundi per bulan."""
+    change = rng.random(len(month)) < WEATHER_CHANGE_PROBABILITY
+    change[0] = True
+    starts = np.flatnonzero(change)
+    cumulative = np.cumsum(params['weather_probability'][month[starts]], axis=1)
+    draws = (rng.random((len(starts), 1)) > cumulative).sum(axis=1)
+    segment = np.cumsum(change) - 1
+    return draws[segment].astype(np.uint8)
+
+
+def _station_hours(params, station_scale, rng):
+    """Kolom cuaca dan jumlah peminjaman untuk satu stasiun."""
+    calendar = params['calendar']
+    month = calendar['mnth'].to_numpy(dtype=np.int64) - 1
+    yr = calendar['yr'].to_numpy(dtype=np.int64)
+    hr = calendar['hr'].to_numpy(dtype=np.int64)
+    workingday = calendar['workingday'].to_numpy(dtype=np.int64)
+
+    columns = {}
+    weathersit = _weathersit(params, month, rng)
+    columns['weathersit'] = weathersit
+    for column in WEATHER_COLUMNS:
+        noisy = params['weather'][column] + rng.normal(0, WEATHER_NOISE[column], len(month))
+        columns[column] = _snap(noisy, params['weather_values'][column]).astype(np.float32)
+
+    rate = (params['profile'][workingday, hr] * params['month_factor'][yr, month]
+            * params['weather_factor'][weathersit] * station_scale)
+    cnt = rng.poisson(rate)
+    casual = rng.binomial(cnt, np.clip(params['casual_share'][workingday, hr], 0, 1))
+    columns['casual'] = casual.astype(np.int32)
+    columns['registered'] = (cnt - casual).astype(np.int32)
+    columns['cnt'] = cnt.astype(np.int32)
+    return columns
+
+
+def synthetic_hours(params, scale, seed=0):
+    """hour_data sintetis dengan `scale` stasiun (len = scale x panjang kalender)."""
+    calendar = params['calendar']
+    length = len(calendar)
+    rows = length * scale
+    rng = np.random.default_rng(seed)
+
+    data = {'instant': np.arange(1, rows + 1, dtype=COLUMN_DTYPES['instant'])}
+    for column in CALENDAR_COLUMNS:
+        data[column] = np.tile(calendar[column].to_numpy().astype(COLUMN_DTYPES[column]), scale)
+    generated = ('weathersit', *WEATHER_COLUMNS, 'casual', 'registered', 'cnt')
+    for column in generated:
+        data[column] = np.empty(rows, dtype=COLUMN_DTYPES[column])
+    # Dinormalkan agar rata-rata volume per stasiun sama dengan data asli
+    station_scales = rng.lognormal(0, STATION_SPREAD, scale)
+    station_scales /= station_scales.mean()
+    for station in range(scale):
+        block = slice(station * length, (station + 1) * length)
+        for column, values in _station_hours(params, station_scales[station], rng).items():
+            data[column][block] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def daily_rollup(hour_data, station_length):
+    """day_data dari hour_data sintetis: satu baris per stasiun per tanggal.
+
+    Jumlah peminjaman dijumlahkan, cuaca dirata-rata; weathersit harian
+    adalah pembulatan rata-rata kode per jam.
+    """
+    station = np.arange(len(hour_data)) // station_length
+    dates = hour_data['dteday'].to_numpy()
+    date_codes, first_dates = pd.factorize(dates[:station_length], sort=True)
+    key = station * len(first_dates) + np.tile(date_codes, len(hour_data) // station_length)
+    size = (len(hour_data) // station_length) * len(first_dates)
+
+    hours = np.bincount(key, minlength=size)
+    first = np.full(size, len(hour_data))
+    np.minimum.at(first, key, np.arange(len(hour_data)))
+
+    day = {'instant': np.arange(1, size + 1, dtype=COLUMN_DTYPES['instant'])}
+    for column in ('dteday', 'season', 'yr', 'mnth', 'holiday', 'weekday', 'workingday'):
+        day[column] = hour_data[column].to_numpy()[first]
+    weathersit = np.bincount(key, hour_data['weathersit'].to_numpy(dtype=np.float64), minlength=size)
+    day['weathersit'] = np.rint(weathersit / hours).astype(COLUMN_DTYPES['weathersit'])
+    for column in WEATHER_COLUMNS:
+        total = np.bincount(key, hour_data[column].to_numpy(dtype=np.float64), minlength=size)
+        day[column] = (total / hours).astype(COLUMN_DTYPES[column])
+    for column in ('casual', 'registered', 'cnt'):
+        total = np.bincount(key, hour_data[column].to_numpy(dtype=np.float64), minlength=size)
+        day[column] = total.astype(COLUMN_DTYPES[column])
+    return pd.DataFrame({column: day[column] for column in DAY_COLUMNS}, copy=False)
+
+
+def synthetic_frames(hour_data, scale, seed=0):
+    """(day_data, hour_data) sintetis berskala `scale` yang dikalibrasi dari hour_data asli."""
+    params = calibrate(hour_data)
+    hours = synthetic_hours(params, scale, seed)
+    return daily_rollup(hours, len(params['calendar'])), hours
@@ -0,0 +1,326 @@
+"""Pencatatan waktu, CPU, memori dan cache hit/miss per bagian dashboard.
+
+Setiap bagian mencatat:
+
+- wall time dan CPU time thread yang menjalankannya;
+- puncak memori Python (tracemalloc, hanya bila BIKESHARE_TRACE_MEMORY=1
+  karena tracing memperlambat render beberapa kali lipat) dan puncak RSS proses;
+- jumlah cache hit/miss: fungsi yang dibungkus cached(...) mencatat
+  miss bila badannya benar-benar dijalankan dan hit bila hasilnya dari cache,
+  FigureCache mencatat dengan cara yang sama.
+
+stage(nama) bisa dipakai di modul tanpa UI (analytics, dll.): tanpa
+SectionTimer yang aktif di thread tersebut, stage() tidak melakukan apa-apa.
+Hasilnya bisa ditulis ke file metrik lokal (JSON lines atau format teks
+Prometheus untuk textfile collector).
+"""
+import contextlib
+import functools
+import json
+import logging
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+
+from bikeshare.store import DATASET_DIR
+
+METRICS_DIR = os.path.join(DATASET_DIR, 'metrics')
+# Prometheus menyimpan run terakhir per halaman (label page), JSON lines menambah baris per run
+METRICS_FORMATS = {'jsonl': 'stages.jsonl', 'prometheus': 'stages-{page}.prom'}
+
+# Format file metrik (jsonl, prometheus atau off) dan lokasinya, lewat variabel lingkungan
+METRICS_FORMAT = os.environ.get('BIKESHARE_METRICS_FORMAT', 'jsonl')
+METRICS_FILE = os.environ.get('BIKESHARE_METRICS_FILE')
+TRACE_MEMORY = os.environ.get('BIKESHARE_TRACE_MEMORY') == '1'
+
+# File JSON lines yang melewati ukuran ini diputar ke <nama>.1
+METRICS_MAX_BYTES = 10 * 1024 * 1024
+
+_local = threading.local()
+logger = logging.getLogger(__name__)
+
+
+def _active():
+    if not hasattr(_local, 'probes'):
+        _local.probes = []
+        _local.timer = None
+    return _local.probes
+
+
+def reset_thread():
+    """Membuang bagian dan timer yang tertinggal di thread ini dari run yang terhenti di tengah jalan.
+
+    Dipanggil di awal skrip sebelum timer halaman dibuat: run yang dihentikan
+    rerun Streamlit tidak sempat memanggil stop(), dan thread skrip bisa
+    dipakai lagi untuk run berikutnya.
+    """
+    _local.probes = []
+    _local.timer = None
+
+
+def _max_rss_mb():
+    # ru_maxrss dalam KB di Linux, byte di macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+class _Probe:
+    """Pengukuran satu bagian di thread saat ini; bagian bersarang ikut menghitung ke bagian luar."""
+
+    def __init__(self, name):
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        # Puncak tracemalloc bersifat global: hanya diukur di thread utama
+        self.trace = tracemalloc.is_tracing() and threading.current_thread() is threading.main_thread()
+        self.peak = 0
+        if self.trace:
+            peak = tracemalloc.get_traced_memory()[1]
+            for probe in _active():
+                probe.peak = max(probe.peak, peak)
+            tracemalloc.reset_peak()
+        _active().append(self)
+        self.start = time.perf_counter()
+        self.cpu_start = time.thread_time()
+
+    def finish(self):
+        wall = time.perf_counter() - self.start
+        cpu = time.thread_time() - self.cpu_start
+        _active().remove(self)
+        peak = max(self.peak, tracemalloc.get_traced_memory()[1]) if self.trace else None
+        return {
+            'wall': wall,
+            'cpu': cpu,
+            'peak_mb': None if peak is None else peak / 2 ** 20,
+            'rss_mb': _max_rss_mb(),
+            'cache_hits': self.hits,
+            'cache_misses': self.misses,
+        }
+
+
+def note_cache(hit):
+    """Mencatat satu hit/miss cache pada semua bagian yang sedang aktif di thread ini."""
+    for probe in _active():
+        if hit:
+            probe.hits += 1
+        else:
+            probe.misses += 1
+
+
+def cached(cache, **options):
+    """Membungkus dekorator cache (SHARED_CACHE, st.cache_resource, ...) agar setiap panggilan tercatat hit/miss.
+
+        @cached(SHARED_CACHE)
+        def compute_x(version): ...
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def compute(*args, **kwargs):
+            # Hanya berjalan ketika cache miss
+            _local.computed[-1] = True
+            return func(*args, **kwargs)
+
+        lookup = cache(compute, **options)
+
+        @functools.wraps(func)
+        def call(*args, **kwargs):
+            if not hasattr(_local, 'computed'):
+                _local.computed = []
+            _local.computed.append(False)
+            try:
+                return lookup(*args, **kwargs)
+            finally:
+                note_cache(hit=not _local.computed.pop())
+
+        call.clear = lookup.clear
+        return call
+    return decorate
+
+
+@contextlib.contextmanager
+def stage(name):
+    """Mengukur bagian `name` ke SectionTimer yang aktif di thread ini (tanpa timer: tidak mencatat)."""
+    _active()
+    timer = _local.timer
+    if timer is None:
+        yield
+        return
+    with timer.stage(name):
+        yield
+
+
+class SectionTimer:
+    """Mencatat metrik antar penanda.
+
+    mark(nama) menutup bagian yang sedang berjalan dan memulai bagian baru,
+    sehingga skrip cukup memanggil mark() di awal setiap bagian tanpa
+    membungkus kodenya. stage(nama) dan staged(nama, task) mengukur bagian
+    bersarang atau task di thread lain ke timer yang sama. Sebagai context
+    manager, stop() dipanggil juga ketika blok keluar lebih awal (return
+    atau exception), sehingga stage() sesudahnya tidak tercatat ke timer ini.
+    """
+
+    def __init__(self, trace_memory=TRACE_MEMORY):
+        self.records = {}
+        self._lock = threading.Lock()
+        self._probe = None
+        self._outer = None
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @property
+    def timings(self):
+        return {name: record['wall'] for name, record in self._finished().items()}
+
+    def _finished(self):
+        with self._lock:
+            return {name: dict(record) for name, record in self.records.items() if record is not None}
+
+    def _reserve(self, name):
+        # Urutan tabel mengikuti awal bagian, bukan akhirnya (bagian bersarang selesai lebih dulu)
+        with self._lock:
+            self.records.setdefault(name, None)
+
+    def _add(self, name, metrics):
+        with self._lock:
+            record = self.records.get(name)
+            if record is None:
+                self.records[name] = dict(metrics, calls=1)
+                return
+            record['calls'] += 1
+            for key, value in metrics.items():
+                if value is None:
+                    continue
+                if key in ('peak_mb', 'rss_mb'):
+                    record[key] = value if record[key] is None else max(record[key], value)
+                else:
+                    record[key] += value
+
+    def mark(self, name=None):
+        _active()
+        if self._probe is not None:
+            self._add(self._probe.name, self._probe.finish())
+        elif name is not None:
+            # Selama ada bagian berjalan, stage() di thread ini tercatat ke timer ini
+            self._outer, _local.timer = _local.timer, self
+        if name is not None:
+            self._reserve(name)
+        self._probe = None if name is None else _Probe(name)
+        if name is None and _local.timer is self:
+            _local.timer = self._outer
+
+    def stop(self):
+        self.mark(None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        _active()
+        outer, _local.timer = _local.timer, self
+        self._reserve(name)
+        probe = _Probe(name)
+        try:
+            yield
+        finally:
+            self._add(name, probe.finish())
+            _local.timer = outer
+
+    def staged(self, name, task):
+        """Task yang diukur sebagai bagian `name` di thread mana pun ia dijalankan."""
+        def run():
+            with self.stage(name):
+                return task()
+        return run
+
+    def record(self, name, seconds):
+        """Mencatat durasi yang diukur di tempat lain."""
+        self._add(name, {'wall': seconds, 'cpu': None, 'peak_mb': None, 'rss_mb': None,
+                         'cache_hits': 0, 'cache_misses': 0})
+
+    def table(self):
+        finished = self._finished()
+        records = list(finished.values())
+        return pd.DataFrame({
+            'Bagian': list(finished),
+            'Waktu (ms)': [record['wall'] * 1000 for record in records],
+            'CPU (ms)': [None if record['cpu'] is None else record['cpu'] * 1000 for record in records],
+            'Puncak memori (MB)': [record['peak_mb'] for record in records],
+            'Puncak RSS (MB)': [record['rss_mb'] for record in records],
+            'Cache hit': [record['cache_hits'] for record in records],
+            'Cache miss': [record['cache_misses'] for record in records],
+        })
+
+    def write_metrics(self, path=None, fmt=METRICS_FORMAT, **labels):
+        """Menulis metrik ke file lokal; `labels` (misalnya page='dashboard') ikut disimpan.
+
+        Bersifat best-effort: jika file tidak bisa ditulis, kesalahannya dicatat
+        ke log dan hasilnya None, halaman tetap tampil.
+        """
+        records = self._finished()
+        if fmt == 'off' or not records:
+            return None
+        if fmt not in METRICS_FORMATS:
+            raise ValueError(f"fmt harus salah satu dari {(*METRICS_FORMATS, 'off')}, bukan {fmt!r}")
+        path = path or METRICS_FILE or os.path.join(
+            METRICS_DIR, METRICS_FORMATS[fmt].format(page=labels.get('page', 'default')))
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            if fmt == 'jsonl':
+                _write_jsonl(path, records, labels)
+            else:
+                _write_prometheus(path, records, labels)
+        except OSError as error:
+            logger.warning("Metrik tidak bisa ditulis ke %s: %s", path, error)
+            return None
+        return path
+
+
+def _write_jsonl(path, records, labels):
+    if os.path.exists(path) and os.path.getsize(path) > METRICS_MAX_BYTES:
+        os.replace(path, path + '.1')
+    timestamp = time.time()
+    with open(path, 'a') as f:
+        for name, record in records.items():
+            f.write(json.dumps({'time': timestamp, **labels, 'stage': name.strip(), **record}) + '\n')
+
+
+PROMETHEUS_METRICS = (
+    ('wall', 'bikeshare_stage_wall_seconds', 'Wall time bagian pada run terakhir'),
+    ('cpu', 'bikeshare_stage_cpu_seconds', 'CPU time thread bagian pada run terakhir'),
+    ('peak_mb', 'bikeshare_stage_peak_memory_megabytes', 'Puncak memori tracemalloc bagian'),
+    ('rss_mb', 'bikeshare_stage_max_rss_megabytes', 'Puncak RSS proses di akhir bagian'),
+    ('cache_hits', 'bikeshare_stage_cache_hits', 'Cache hit bagian pada run terakhir'),
+    ('cache_misses', 'bikeshare_stage_cache_misses', 'Cache miss bagian pada run terakhir'),
+)
+
+
+def _label_value(value):
+    return str(value).strip().replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _label_text(labels):
+    return ','.join(f'{key}="{_label_value(value)}"' for key, value in labels.items())
+
+
+def _write_prometheus(path, records, labels):
+    """Gauge per bagian untuk run terakhir; ditulis atomik agar collector tidak membaca file setengah jadi."""
+    lines = []
+    for key, metric, description in PROMETHEUS_METRICS:
+        lines += [f'# HELP {metric} {description}', f'# TYPE {metric} gauge']
+        for name, record in records.items():
+            if record[key] is not None:
+                lines.append(f'{metric}{{{_label_text({**labels, "stage": name})}}} {record[key]:.6g}')
+    staging = path + '.tmp'
+    with open(staging, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    os.replace(staging, path)
@@ -1,41 +1,232 @@
+import threading
+from functools import partial
+
 import streamlit as st
 import numpy as np
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-from scipy import stats
-from statsmodels.tsa.seasonal import seasonal_decompose
-from sklearn.cluster import KMeans
+
+from bikeshare import analytics, store
+from bikeshare.analytics import read_result
+from bikeshare.binning import WEATHER_COLUMNS
+from bikeshare.charts import (FIGURE_CACHE, arc_spec, bar_spec, cached_png, concat_spec, fold, heatmap_spec,
+                             line_spec, long_matrix, scatter_spec)
+from bikeshare.cube import slice_cube
+from bikeshare.executor import run_panels
+from bikeshare.ingest import data_version
+from bikeshare.segmentation import fit_segments, update_segments
+from bikeshare.shared import SHARED_CACHE
+from bikeshare.store import TABLES, is_stale
+from bikeshare.timing import SectionTimer, cached, reset_thread, stage
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 
 st.sidebar.page_link("uas_streamlit.py", label="Dashboard")
 
+# Mode grafik ringan: spesifikasi Vega-Lite dirender di browser, tanpa matplotlib
+light_charts = st.sidebar.toggle("Grafik ringan (Vega-Lite)", value=False)
+
+# Panel debug tersembunyi (metrik per bagian), hanya tampil dengan ?debug=1 di URL
+debug = st.query_params.get('debug') == '1'
+
+# Setiap bagian dihitung lewat fungsi ber-cache yang dikunci pada input yang benar-benar dibacanya
+# (versi data, dan filter tahun hanya untuk bagian yang memakainya), sehingga rerun hanya
+# menghitung ulang panel yang terdampak
+# Run sebelumnya yang terhenti oleh rerun tidak sempat menutup timernya
+reset_thread()
+timer = SectionTimer()
+timer.mark("Persiapan")
+version = data_version()
+
 # Judul dan informasi proyek
 st.title("Dashboard Analisis Bike Sharing")
 
-# Import dataset
-@st.cache_data
-def load_data():
-    day_data = pd.read_csv('datasets/day.csv')
-    hour_data = pd.read_csv('datasets/hour.csv')
-    return day_data, hour_data
 
-day_data, hour_data = load_data()
+# Menampilkan grafik: PNG matplotlib dari cache (dirender ulang hanya jika data berubah)
+# atau spesifikasi Vega-Lite jika mode grafik ringan aktif
+def show_chart(name, render, *data, spec=None, spec_data=None):
+    with stage(f"  render: {name}"):
+        if light_charts and spec is not None:
+            st.vega_lite_chart(data[0] if spec_data is None else spec_data, spec, width='stretch')
+        else:
+            st.image(cached_png(name, render, *data), width='stretch', output_format='PNG')
+
+
+# Hasil batch (python -m bikeshare.analytics) dipakai jika dihitung untuk versi data yang sama;
+# jika belum ada atau sudah usang, panel dihitung langsung dengan fungsi analisis yang sama.
+def precomputed(name, compute):
+    result = read_result(name, version)
+    return compute() if result is None else result
+
+
+# Data (cache kolumnar .npy ditambah batch ingest) dan agregat disimpan sekali per proses di cache
+# bersama: read-only, dibatasi anggaran memori dengan pengusiran LRU, dan dibagikan ke semua sesi
+# tanpa salinan (st.cache_data mem-pickle hasilnya per pemanggilan). State per sesi hanya pilihan filter.
+@cached(SHARED_CACHE)
+def load_data(version):
+    return analytics.load_data()
+
+
+# State ingest dibuka (atau dibangun ulang bila CSV dasar berubah) sekali per versi data,
+# bukan per panel yang memakainya
+@cached(SHARED_CACHE)
+def load_ingest(version):
+    return analytics.ingest_state()
+
+
+# Kubus agregasi untuk panel groupby, dibangun ulang hanya jika data berubah
+@cached(SHARED_CACHE)
+def load_cubes(version):
+    _, hour_data = load_data(version)
+    # Dengan batch ingest, kubus diambil dari state ingest (digabung per batch, tanpa groupby ulang)
+    return analytics.build_cubes(hour_data, ingest=load_ingest(version))
+
+
+# Model segmentasi per filter tahun (urut), dipakai ulang lintas versi data: baris dari batch ingest
+# baru hanya diberi label dengan predict() terhadap centroid yang ada, bukan melatih ulang seluruh histori
+@cached(st.cache_resource)
+def segment_model_state(yr_values):
+    return {'lock': threading.Lock(), 'model': None, 'rows': 0, 'base': None}
+
+
+def load_segment_model(yr_values, cluster_data, rows):
+    """Model untuk hour_data dengan `rows` baris; dilatih ulang hanya jika data dasar berubah."""
+    state = segment_model_state(yr_values)
+    base = store.data_version()
+    with state['lock']:
+        if state['model'] is None or state['base'] != base or rows < state['rows']:
+            with stage("KMeans"):
+                state['model'] = fit_segments(cluster_data, n_clusters=3)
+        elif rows > state['rows']:
+            # Indeks cluster_data adalah posisi baris hour_data; batch ingest ditambahkan di akhir
+            state['model'] = update_segments(state['model'], cluster_data[cluster_data.index >= state['rows']])
+        state['rows'], state['base'] = rows, base
+        return state['model']
+
+
+@cached(SHARED_CACHE)
+def compute_monthly_trend(version):
+    return precomputed('monthly_trend', lambda: analytics.monthly_trend(load_cubes(version)[0]))
+
+
+# Segmentasi hanya memberi label pada titik sampel yang digambar, dengan model ber-cache per filter.
+# yr_values diurutkan pemanggil agar urutan pilihan di multiselect tidak membuat kunci baru.
+@cached(SHARED_CACHE)
+def compute_segments(version, yr_values):
+    def compute():
+        _, hour_data = load_data(version)
+        cluster_data = analytics.segment_data(hour_data, yr_values)
+        model = load_segment_model(yr_values, cluster_data, len(hour_data))
+        return analytics.segment_points(model, cluster_data)
+
+    # Hasil batch hanya tersedia untuk semua tahun
+    all_years = yr_values == analytics.year_values(load_cubes(version)[0])
+    return precomputed('segments', compute) if all_years else compute()
+
+
+# Korelasi dihitung dari sketch (kovarians dan histogram peringkat) tanpa outlier, bukan .corr() atas frame bersih
+CORRELATION_METHODS = {'Pearson': 'pearson', 'Spearman': 'spearman'}
+CORRELATION_RESULTS = {'pearson': 'correlation', 'spearman': 'correlation_spearman'}
+
+
+@cached(SHARED_CACHE)
+def compute_correlation(version, method='pearson'):
+    return precomputed(CORRELATION_RESULTS[method], lambda: analytics.correlation(
+        load_data(version)[1], method, ingest=load_ingest(version)))
+
+
+# Model dekomposisi per proses: setelah batch ingest (versi data baru) hanya ujung deret yang
+# dihitung ulang, bukan seluruh MSTL
+@st.cache_resource
+def decomposition_models():
+    from bikeshare.decomposition import DAY_PERIODS, HOUR_PERIODS, IncrementalDecomposition
+
+    return {'day': IncrementalDecomposition(DAY_PERIODS), 'hour': IncrementalDecomposition(HOUR_PERIODS)}
+
+
+# Dekomposisi STL/MSTL: trend terdefinisi hingga ujung deret, dengan musiman mingguan dan tahunan
+@cached(SHARED_CACHE)
+def compute_decomposition(version):
+    return precomputed('decomposition', lambda: analytics.decomposition(
+        load_data(version)[0], model=decomposition_models()['day']))
+
+
+# Data per jam: musiman harian dan mingguan
+@cached(SHARED_CACHE)
+def compute_hourly_decomposition(version):
+    return precomputed('hourly_decomposition', lambda: analytics.hourly_decomposition(
+        load_data(version)[1], model=decomposition_models()['hour']))
+
+
+@cached(SHARED_CACHE)
+def compute_windspeed(version):
+    results = [read_result(name, version) for name in ('windspeed', 'windspeed_ranges')]
+    if any(result is None for result in results):
+        return analytics.windspeed_bins(load_data(version)[1])
+    return tuple(results)
+
+
+@cached(SHARED_CACHE)
+def compute_weather_distribution(version, column):
+    return precomputed(f'distribution_{column}',
+                       lambda: analytics.weather_distribution(load_data(version)[1], column))
+
+
+order = analytics.WEEKDAY_ORDER
+
+# Warna tetap per rentang waktu dan kategori cuaca (urutan label seperti sebelumnya)
+TIME_OF_DAY_COLORS = {'Malam': 'blue', 'Pagi': 'green', 'Siang': 'orange', 'Sore': 'red'}
+WEATHER_COLORS = {'Berawan/Berkabut': 'blue', 'Cerah/Sedikit berawan': 'green', 'Cuaca Ekstrim': 'orange',
+                  'Hujan Salju/Badai': 'red', 'Tidak Valid': 'gray'}
+
+
+@cached(SHARED_CACHE)
+def compute_holiday(version):
+    return precomputed('holiday', lambda: analytics.holiday_means(load_data(version)[0]))
+
+
+@cached(SHARED_CACHE)
+def compute_season_means(version):
+    return precomputed('season_means', lambda: analytics.season_means(load_cubes(version)[0]))
+
+
+# Mapping tahun ke nilai 'yr' dalam dataset; tahun dari batch ingest ikut muncul di filter
+# (dari sel kubus, bukan seluruh baris per jam)
+year_mapping = {analytics.calendar_year(yr): yr for yr in analytics.year_values(load_cubes(version)[0])}
+
+# Data semua panel dihitung bersamaan di thread pool, lalu dirender berurutan di bawah.
+# Segmentasi ikut dihitung untuk pilihan tahun terakhir agar fragment filter langsung mendapat cache.
+timer.mark("Komputasi panel (paralel)")
+script_ctx = get_script_run_ctx()
+panel_tasks = {
+    'Kubus agregasi': partial(load_cubes, version),
+    'Tren bulanan': partial(compute_monthly_trend, version),
+    'Korelasi': partial(compute_correlation, version,
+                        CORRELATION_METHODS[st.session_state.get('correlation_method', 'Pearson')]),
+    'Time series': partial(compute_decomposition, version),
+    'Time series per jam': partial(compute_hourly_decomposition, version),
+    'Windspeed': partial(compute_windspeed, version),
+    'Hari libur': partial(compute_holiday, version),
+    'Musim': partial(compute_season_means, version),
+}
+prefetch_years = st.session_state.get('selected_years', list(year_mapping))
+prefetch_yr_values = tuple(sorted(year_mapping[year] for year in prefetch_years if year in year_mapping))
+if prefetch_yr_values:
+    panel_tasks['Segmentasi'] = partial(compute_segments, version, prefetch_yr_values)
+panel_data, _ = run_panels(
+    {panel: timer.staged(f"  paralel: {panel}", task) for panel, task in panel_tasks.items()},
+    initializer=lambda: add_script_run_ctx(threading.current_thread(), script_ctx))
 
-# Menghapus outlier
-z_scores = np.abs(stats.zscore(hour_data['cnt']))
-threshold = 3
-non_outliers = np.where(z_scores <= threshold)
-df_cleaned = hour_data.iloc[non_outliers]
 
 # Tren penyewaan sepeda per bulan
+timer.mark("Tren bulanan")
 st.subheader("Tren Penyewaan Sepeda Berdasarkan Bulan")
-monthly_trend = day_data.groupby(['yr', 'mnth'])['cnt'].sum().reset_index()
+monthly_trend = panel_data['Tren bulanan']
 
 monthly_trend_label = monthly_trend.copy()
 
 # Mengubah nilai pada kolom 'yr'
-monthly_trend_label['yr'] = monthly_trend_label['yr'].map({0: 'Tahun Pertama', 1: 'Tahun Kedua'})
+monthly_trend_label['yr'] = monthly_trend_label['yr'].map(analytics.year_name)
 
 # Mengubah nama kolom
 monthly_trend_label = monthly_trend_label.rename(columns={'yr': 'Tahun', 'mnth': 'Bulan', 'cnt': 'Jumlah'})
@@ -43,16 +234,24 @@ monthly_trend_label = monthly_trend_label.rename(columns={'yr': 'Tahun', 'mnth':
 # Menampilkan dataframe tanpa index
 st.dataframe(monthly_trend_label, hide_index=True)
 
-fig, ax = plt.subplots(figsize=(10, 6))
-sns.lineplot(data=monthly_trend, x='mnth', y='cnt', hue='yr', palette=['blue', 'orange'], ax=ax)
-ax.set_title('Tren Penyewaan Sepeda Berdasarkan Bulan di Tahun Pertama dan Kedua')
-ax.set_xlabel('Bulan')
-ax.set_ylabel('Jumlah Penyewaan (cnt)')
-legend_labels = ['Tahun Pertama', 'Tahun Kedua']
-legend_colors = ['blue', 'orange']
-plt.legend(handles=[plt.Line2D([0], [0], color=color, lw=2) for color in legend_colors],
-           labels=legend_labels, title="Tahun", loc='best')
-st.pyplot(fig)
+def plot_monthly_trend(monthly_trend):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    # Biru dan oranye untuk dua tahun pertama, warna tab10 berikutnya untuk tahun dari batch ingest
+    years = analytics.year_values(monthly_trend)
+    colors = dict(zip(years, ['blue', 'orange', *sns.color_palette('tab10')[2:]]))
+    sns.lineplot(data=monthly_trend, x='mnth', y='cnt', hue='yr', palette=colors, ax=ax)
+    ax.set_title('Tren Penyewaan Sepeda Berdasarkan Bulan per Tahun')
+    ax.set_xlabel('Bulan')
+    ax.set_ylabel('Jumlah Penyewaan (cnt)')
+    ax.legend(handles=[plt.Line2D([0], [0], color=colors[yr], lw=2) for yr in years],
+              labels=[analytics.year_name(yr) for yr in years], title="Tahun", loc='best')
+    return fig
+
+
+show_chart('monthly_trend', plot_monthly_trend, monthly_trend,
+           spec=line_spec('Bulan', 'Jumlah', color='Tahun',
+                          title='Tren Penyewaan Sepeda Berdasarkan Bulan per Tahun'),
+           spec_data=monthly_trend_label)
 
 with st.expander("Hasil Analisis Tren Penyewaan Sepeda Berdasarkan Bulan"):
     st.write("""
@@ -65,34 +264,38 @@ with st.expander("Hasil Analisis Tren Penyewaan Sepeda Berdasarkan Bulan"):
     """)
 
 # Pertanyaan 2: Pengaruh Waktu dan Cuaca terhadap Penyewaan Sepeda
+timer.mark("Filter tahun")
 st.header("Pengaruh Waktu dan Cuaca terhadap Penyewaan Sepeda")
 
-# Menambahkan filter tahun multi-select
-selected_years = st.multiselect("Pilih Tahun", options=[2011, 2012], default=[2011, 2012])
 
-# Mapping tahun ke nilai 'yr' dalam dataset
-year_mapping = {2011: 0, 2012: 1}
-selected_yr_values = [year_mapping[year] for year in selected_years]
+# Bagian ini satu-satunya yang membaca filter tahun; sebagai fragment, perubahan filter
+# hanya menjalankan ulang fungsi ini, bukan seluruh halaman
+@st.fragment
+def year_filter_section():
+    # Timer ditutup juga ketika panel berhenti lebih awal (filter kosong)
+    with SectionTimer() as section_timer:
+        year_filter_panels(section_timer)
+    section_timer.write_metrics(page='filter_tahun')
+    if debug:
+        st.caption("Metrik per bagian (filter tahun)")
+        st.dataframe(section_timer.table(), hide_index=True)
 
-# Filter data berdasarkan tahun yang dipilih
-filtered_data = df_cleaned[df_cleaned['yr'].isin(selected_yr_values)]
 
-dataQuestion = df_cleaned
-dataQuestion2 = filtered_data
+def year_filter_panels(section_timer):
+    section_timer.mark("Hari dalam seminggu")
+    _, cleaned_cube = load_cubes(version)
 
-if not dataQuestion2.empty:
-    # Mapping nama hari
-    filtered_data['weekday'] = filtered_data['weekday'].map({
-        0: 'Senin', 1: 'Selasa', 2: 'Rabu', 3: 'Kamis',
-        4: 'Jumat', 5: 'Sabtu', 6: 'Minggu'
-    })
+    # Menambahkan filter tahun multi-select
+    selected_years = st.multiselect("Pilih Tahun", options=list(year_mapping), default=list(year_mapping),
+                                    key='selected_years')
+    selected_yr_values = [year_mapping[year] for year in selected_years]
 
-    # Mengelompokkan data berdasarkan hari dalam seminggu
-    total_eachday = filtered_data.groupby('weekday')[['casual', 'registered']].sum().reset_index()
+    if slice_cube(cleaned_cube, {'yr': selected_yr_values}).empty:
+        st.warning("Beberapa data tidak tersedia untuk filter tahun yang Anda pilih")
+        return
 
-    # Urutkan berdasarkan urutan hari dalam seminggu
-    order = ['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Minggu']
-    total_eachday = total_eachday.set_index('weekday').loc[order].reset_index();
+    # Mengelompokkan data berdasarkan hari dalam seminggu, urut Senin..Minggu
+    total_eachday = analytics.weekday_users(cleaned_cube, selected_yr_values)
 
     # Streamlit UI
     st.title("Analisis Penggunaan Sepeda")
@@ -103,66 +306,55 @@ if not dataQuestion2.empty:
     st.dataframe(total_eachday_display, hide_index=True)
 
     # Visualisasi dengan grafik batang berkelompok
-    fig, ax = plt.subplots(figsize=(10, 6))
-    x = np.arange(len(order))  # Lokasi weekday pada sumbu x
-    width = 0.35  # Lebar batang
+    def plot_each_day(total_eachday):
+        fig, ax = plt.subplots(figsize=(10, 6))
+        x = np.arange(len(total_eachday))  # Lokasi weekday pada sumbu x
+        width = 0.35  # Lebar batang
 
-    ax.bar(x - width/2, total_eachday['casual'], width, label='Casual', color='blue')
-    ax.bar(x + width/2, total_eachday['registered'], width, label='Registered', color='orange')
+        ax.bar(x - width/2, total_eachday['casual'], width, label='Casual', color='blue')
+        ax.bar(x + width/2, total_eachday['registered'], width, label='Registered', color='orange')
 
-    # Menambahkan label, judul, dan legenda
-    ax.set_title("Jumlah Pengguna Casual dan Registered per Hari")
-    ax.set_xlabel("Hari")
-    ax.set_ylabel("Jumlah Pengguna")
-    ax.set_xticks(x)
-    ax.set_xticklabels(total_eachday['weekday'])
-    ax.legend()
+        # Menambahkan label, judul, dan legenda
+        ax.set_title("Jumlah Pengguna Casual dan Registered per Hari")
+        ax.set_xlabel("Hari")
+        ax.set_ylabel("Jumlah Pengguna")
+        ax.set_xticks(x)
+        ax.set_xticklabels(total_eachday['weekday'])
+        ax.legend()
+        return fig
 
-    # Menampilkan grafik di Streamlit
-    st.pyplot(fig)
-
-    def time_of_day(hour):
-        if 6 <= hour < 12:
-            return 'Pagi'
-        elif 12 <= hour < 18:
-            return 'Siang'
-        elif 18 <= hour < 20:
-            return 'Sore'
-        else:
-            return 'Malam'
-
-
-    def weather_of_day(weathersit):
-        if weathersit == 1:
-            return 'Cerah/Sedikit berawan'
-        elif weathersit == 2:
-            return 'Berawan/Berkabut'
-        elif weathersit == 3:
-            return 'Hujan Salju/Badai'
-        elif weathersit == 4:
-            return 'Cuaca Ekstrim'
-        else:
-            return 'Tidak Valid'
 
+    # Menampilkan grafik di Streamlit
+    show_chart('each_day', plot_each_day, total_eachday,
+               spec=fold(bar_spec('Hari', 'Jumlah', color='Pengguna', sort=order,
+                                  title="Jumlah Pengguna Casual dan Registered per Hari"),
+                         ['Casual', 'Registered'], ('Pengguna', 'Jumlah')),
+               spec_data=total_eachday_display)
 
-    dataQuestion2['rentang_waktu'] = dataQuestion2['hr'].apply(time_of_day)
-    dataQuestion2['weather_category'] = dataQuestion2['weathersit'].apply(weather_of_day)
+    # Label rentang waktu dan cuaca cukup dihitung pada sel kubus, bukan per baris jam
+    dataEachTime, time_rental_data = analytics.time_of_day_totals(cleaned_cube, selected_yr_values)
+    dataEachWeather = analytics.weather_totals(cleaned_cube, selected_yr_values)
 
     # Clustering berdasarkan waktu dan cuaca
+    section_timer.mark("Segmentasi")
     st.header("Segmentasi Pengguna Berdasarkan Pola Penyewaan")
 
     # Menyiapkan data untuk clustering
-    cluster_data = dataQuestion2[['hr', 'weathersit', 'cnt']]
-    kmeans = KMeans(n_clusters=3, random_state=42)
-    dataQuestion2['cluster'] = kmeans.fit_predict(cluster_data)
+    cluster_points = compute_segments(version, tuple(sorted(selected_yr_values)))
 
-    # Visualisasi clustering
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.scatterplot(x='hr', y='cnt', hue='cluster', data=dataQuestion2, palette='viridis', ax=ax)
-    plt.title("Segmentasi Pengguna Berdasarkan Pola Penyewaan")
-    plt.xlabel("Jam (hr)")
-    plt.ylabel("Jumlah Penyewaan (cnt)")
-    st.pyplot(fig)
+    # Visualisasi clustering (sampel titik, bukan seluruh baris per jam)
+    def plot_segments(cluster_points):
+        fig, ax = plt.subplots(figsize=(10, 6))
+        sns.scatterplot(x='hr', y='cnt', hue='cluster', data=cluster_points, palette='viridis', ax=ax)
+        ax.set_title("Segmentasi Pengguna Berdasarkan Pola Penyewaan")
+        ax.set_xlabel("Jam (hr)")
+        ax.set_ylabel("Jumlah Penyewaan (cnt)")
+        return fig
+
+
+    show_chart('segments', plot_segments, cluster_points,
+               spec=scatter_spec('hr', 'cnt', color='cluster', title="Segmentasi Pengguna Berdasarkan Pola Penyewaan",
+                                 x_title="Jam (hr)", y_title="Jumlah Penyewaan (cnt)"))
 
     with st.expander("Hasil Analisis Segmentasi Pengguna"):
         st.write("""
@@ -176,38 +368,39 @@ if not dataQuestion2.empty:
         """)
 
     # Visualisasi berdasarkan waktu
+    section_timer.mark("Rentang waktu")
     st.subheader("Jumlah Penyewaan Sepeda Berdasarkan Rentang Waktu")
-    dataEachTime = dataQuestion2.groupby('rentang_waktu')['cnt'].sum().reset_index()
-
-    time_rental_data = (
-        dataQuestion2.groupby(["yr", "rentang_waktu"])["cnt"]
-        .sum()
-        .reset_index()
-        .replace({"yr": {0: 2011, 1: 2012}})
-    )
+    time_rental_data = time_rental_data.assign(yr=time_rental_data['yr'].map(analytics.calendar_year))
     time_rental_data = time_rental_data.rename(columns={'yr': 'Tahun', 'rentang_waktu': 'Waktu', 'cnt': 'Jumlah'})
 
     st.dataframe(time_rental_data.style.format({"Tahun": "{:d}"}), hide_index=True)
 
-    fig, ax = plt.subplots(1, 2, figsize=(14, 6))
-    x = np.arange(len(dataEachTime))
-    width = 0.35
+    # Warna per label, bukan per posisi: filter tahun yang pendek bisa tidak memuat semua rentang/kategori
+    def plot_each_time(dataEachTime):
+        fig, ax = plt.subplots(1, 2, figsize=(14, 6))
+        x = np.arange(len(dataEachTime))
+        width = 0.35
+
+        colors = dataEachTime['rentang_waktu'].map(TIME_OF_DAY_COLORS).tolist()
+        bars = ax[0].bar(x, dataEachTime['cnt'], width, label='Penyewaan Sepeda', color=colors)
+        ax[0].set_title("Jumlah Penyewaan Sepeda Berdasarkan Rentang Waktu")
+        ax[0].set_xlabel("Rentang Waktu")
+        ax[0].set_ylabel("Jumlah Penyewaan (cnt)")
+        ax[0].set_xticks(x, dataEachTime['rentang_waktu'])
 
-    bars = ax[0].bar(x, dataEachTime['cnt'], width, label='Penyewaan Sepeda', color=['blue', 'green', 'orange', 'red'])
-    ax[0].set_title("Jumlah Penyewaan Sepeda Berdasarkan Rentang Waktu")
-    ax[0].set_xlabel("Rentang Waktu")
-    ax[0].set_ylabel("Jumlah Penyewaan (cnt)")
-    ax[0].set_xticks(x, dataEachTime['rentang_waktu'])
+        for bar in bars:
+            yval = bar.get_height()
+            ax[0].text(bar.get_x() + bar.get_width() / 2, yval + 0.5, f'{int(yval)}', ha='center', va='bottom', fontsize=12)
 
-    for bar in bars:
-        yval = bar.get_height()
-        ax[0].text(bar.get_x() + bar.get_width() / 2, yval + 0.5, f'{int(yval)}', ha='center', va='bottom', fontsize=12)
+        ax[1].pie(dataEachTime['cnt'], labels=dataEachTime['rentang_waktu'], autopct='%1.2f%%', colors=colors)
+        ax[1].set_title("Pie Chart Proporsi Penyewaan Sepeda Berdasarkan Rentang Waktu")
+        return fig
 
-    ax[1].pie(dataEachTime['cnt'], labels=dataEachTime['rentang_waktu'], autopct='%1.2f%%',
-              colors=['blue', 'green', 'orange', 'red'])
-    ax[1].set_title("Pie Chart Proporsi Penyewaan Sepeda Berdasarkan Rentang Waktu")
 
-    st.pyplot(fig)
+    show_chart('each_time', plot_each_time, dataEachTime,
+               spec=concat_spec(bar_spec('rentang_waktu', 'cnt', title="Jumlah Penyewaan Sepeda Berdasarkan Rentang Waktu",
+                                         x_title="Rentang Waktu", y_title="Jumlah Penyewaan (cnt)"),
+                                arc_spec('cnt', 'rentang_waktu', title="Proporsi Penyewaan Sepeda Berdasarkan Rentang Waktu")))
 
     # Analisis dinamis berdasarkan tahun yang dipilih
     with st.expander("Hasil Analisis Penyewaan Sepeda Berdasarkan Rentang Waktu"):
@@ -227,35 +420,42 @@ if not dataQuestion2.empty:
             "Kesimpulannya, waktu siang adalah waktu paling populer untuk penyewaan sepeda, sedangkan sore hari adalah waktu dengan jumlah penyewaan paling sedikit.")
 
     # Visualisasi berdasarkan cuaca
+    section_timer.mark("Kondisi cuaca")
     st.subheader("Jumlah Penyewaan Sepeda Berdasarkan Kondisi Cuaca")
 
-    dataEachWeather = dataQuestion2.groupby('weather_category')['cnt'].sum().reset_index()
     total_rentals = dataEachWeather['cnt'].sum()
-    dataEachWeather['proportion'] = dataEachWeather['cnt'] / total_rentals
 
     dataEachWeatherLabel = dataEachWeather
     dataEachWeatherLabel = dataEachWeatherLabel.rename(columns={'weather_category': 'Kategori Cuaca', 'cnt': 'Jumlah', 'proportion': 'Proporsi'})
     dataEachWeatherLabel['Proporsi'] = dataEachWeatherLabel['Proporsi'] * 100
     st.dataframe(dataEachWeatherLabel, hide_index=True)
 
-    fig, ax = plt.subplots(1, 2, figsize=(14, 6))
-    x = np.arange(len(dataEachWeather))
+    def plot_each_weather(dataEachWeather):
+        fig, ax = plt.subplots(1, 2, figsize=(14, 6))
+        x = np.arange(len(dataEachWeather))
+        width = 0.35
+
+        colors = dataEachWeather['weather_category'].map(WEATHER_COLORS).tolist()
+        bars = ax[0].bar(x, dataEachWeather['cnt'], width, label='Penyewaan Sepeda', color=colors)
+        ax[0].set_title("Jumlah Penyewaan Sepeda Berdasarkan Kondisi Cuaca")
+        ax[0].set_xlabel("Kondisi Cuaca (weathersit)")
+        ax[0].set_ylabel("Jumlah Penyewaan (cnt)")
+        ax[0].set_xticks(x, dataEachWeather['weather_category'])
 
-    bars = ax[0].bar(x, dataEachWeather['cnt'], width, label='Penyewaan Sepeda', color=['blue', 'green', 'orange', 'red'])
-    ax[0].set_title("Jumlah Penyewaan Sepeda Berdasarkan Kondisi Cuaca")
-    ax[0].set_xlabel("Kondisi Cuaca (weathersit)")
-    ax[0].set_ylabel("Jumlah Penyewaan (cnt)")
-    ax[0].set_xticks(x, dataEachWeather['weather_category'])
+        for bar in bars:
+            yval = bar.get_height()
+            ax[0].text(bar.get_x() + bar.get_width() / 2, yval + 0.5, f'{int(yval)}', ha='center', va='bottom', fontsize=12)
 
-    for bar in bars:
-        yval = bar.get_height()
-        ax[0].text(bar.get_x() + bar.get_width() / 2, yval + 0.5, f'{int(yval)}', ha='center', va='bottom', fontsize=12)
+        ax[1].pie(dataEachWeather['proportion'], labels=dataEachWeather['weather_category'], autopct='%1.2f%%',
+                  colors=colors)
+        ax[1].set_title("Pie Chart Proporsi Penyewaan Sepeda Berdasarkan Kondisi Cuaca")
+        return fig
 
-    ax[1].pie(dataEachWeather['proportion'], labels=dataEachWeather['weather_category'], autopct='%1.2f%%',
-              colors=['blue', 'green', 'orange', 'red'])
-    ax[1].set_title("Pie Chart Proporsi Penyewaan Sepeda Berdasarkan Kondisi Cuaca")
 
-    st.pyplot(fig)
+    show_chart('each_weather', plot_each_weather, dataEachWeather,
+               spec=concat_spec(bar_spec('weather_category', 'cnt', title="Jumlah Penyewaan Sepeda Berdasarkan Kondisi Cuaca",
+                                         x_title="Kondisi Cuaca (weathersit)", y_title="Jumlah Penyewaan (cnt)"),
+                                arc_spec('cnt', 'weather_category', title="Proporsi Penyewaan Sepeda Berdasarkan Kondisi Cuaca")))
 
     # Analisis dinamis berdasarkan tahun yang dipilih
     with st.expander("Hasil Analisis Penyewaan Sepeda Berdasarkan Kondisi Cuaca"):
@@ -271,21 +471,30 @@ if not dataQuestion2.empty:
         **Kesimpulan:**  
         Jumlah penyewaan sepeda sangat dipengaruhi oleh kondisi cuaca. Pengguna lebih memilih menyewa sepeda saat cuaca cerah atau sedikit berawan, sementara cuaca ekstrem dan hujan menyebabkan penurunan signifikan dalam jumlah penyewaan.
         """)
-else:
-    st.warning("Beberapa data tidak tersedia untuk filter tahun yang Anda pilih")
+
+
+year_filter_section()
+
 
 # Analisis korelasi
+timer.mark("Korelasi")
 st.header("Analisis Korelasi Faktor Penyewaan Sepeda")
 
 # Menyiapkan data untuk analisis korelasi
-correlation_data = dataQuestion[['temp', 'hum', 'windspeed', 'cnt']]
-correlation_matrix = correlation_data.corr()
+st.radio("Metode korelasi", list(CORRELATION_METHODS), horizontal=True, key='correlation_method')
+correlation_matrix = panel_data['Korelasi']
 
 # Visualisasi matriks korelasi
-fig, ax = plt.subplots(figsize=(10, 6))
-sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', ax=ax)
-plt.title("Matriks Korelasi Faktor Penyewaan Sepeda")
-st.pyplot(fig)
+def plot_correlation(correlation_matrix):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', ax=ax)
+    ax.set_title("Matriks Korelasi Faktor Penyewaan Sepeda")
+    return fig
+
+
+show_chart('correlation', plot_correlation, correlation_matrix,
+           spec=heatmap_spec(title="Matriks Korelasi Faktor Penyewaan Sepeda"),
+           spec_data=long_matrix(correlation_matrix))
 
 with st.expander("Hasil Analisis Korelasi"):
     st.write("""
@@ -298,24 +507,32 @@ with st.expander("Hasil Analisis Korelasi"):
     Faktor cuaca seperti suhu, kelembaban, dan kecepatan angin memiliki pengaruh signifikan terhadap jumlah penyewaan sepeda.
     """)
 
+timer.mark("Time series")
 st.header("Analisis Time Series Penyewaan Sepeda")
+decomposition_data = panel_data['Time series']
 
-# Menyiapkan data time series
-time_series_data = day_data.set_index('dteday')['cnt']
-decomposition = seasonal_decompose(time_series_data, model='additive', period=365)
 
 # Visualisasi time series
-fig, (ax1, ax2, ax3, ax4) = plt.subplots(4, 1, figsize=(12, 8))
-decomposition.trend.plot(ax=ax1)
-ax1.set_title('Trend')
-decomposition.seasonal.plot(ax=ax2)
-ax2.set_title('Seasonality')
-decomposition.resid.plot(ax=ax3)
-ax3.set_title('Residuals')
-time_series_data.plot(ax=ax4)
-ax4.set_title('Original Data')
-plt.tight_layout()
-st.pyplot(fig)
+def plot_decomposition(decomposition_data):
+    fig, axes = plt.subplots(len(decomposition_data.columns), 1, figsize=(12, 2 * len(decomposition_data.columns)))
+    for ax, component in zip(axes, decomposition_data.columns):
+        decomposition_data[component].plot(ax=ax)
+        ax.set_title(component)
+    fig.tight_layout()
+    return fig
+
+
+show_chart('decomposition', plot_decomposition, decomposition_data,
+           spec=fold(line_spec('dteday', 'nilai', row='komponen', x_kind='temporal'),
+                     list(decomposition_data.columns), ('komponen', 'nilai')),
+           spec_data=decomposition_data.reset_index())
+
+st.subheader("Dekomposisi Penyewaan per Jam (4 Minggu Terakhir)")
+hourly_decomposition = panel_data['Time series per jam'].iloc[-4 * 168:]
+show_chart('hourly_decomposition', plot_decomposition, hourly_decomposition,
+           spec=fold(line_spec('dteday', 'nilai', row='komponen', x_kind='temporal'),
+                     list(hourly_decomposition.columns), ('komponen', 'nilai')),
+           spec_data=hourly_decomposition.reset_index())
 
 with st.expander("Hasil Analisis Time Series"):
     st.write("""
@@ -329,81 +546,99 @@ with st.expander("Hasil Analisis Time Series"):
     """)
 
 # Pertanyaan 1: Pengaruh Windspeed terhadap Peminjaman Sepeda
+timer.mark("Windspeed")
 st.header("Pengaruh Windspeed terhadap Peminjaman Sepeda")
-collectByWindSpeed = day_data.groupby('windspeed')['cnt'].sum().reset_index()
-
-fig1, ax1 = plt.subplots(figsize=(10, 6))
-ax1.scatter(collectByWindSpeed['windspeed'], collectByWindSpeed['cnt'], alpha=0.5, color='orange')
-ax1.set_title('Hubungan antara Windspeed dan Jumlah Peminjaman Sepeda')
-ax1.set_xlabel('Kecepatan Angin (Windspeed)')
-ax1.set_ylabel('Jumlah Peminjaman Sepeda (cnt)')
-ax1.grid()
-st.pyplot(fig1)  # Menampilkan plot pertama
-
-# Mengelompokkan Windspeed menjadi Kategori
-collectByWindSpeed['windspeed_range'] = pd.cut(
-    collectByWindSpeed['windspeed'],
-    bins=[0, 0.1, 0.2, 0.3, 0.4, 1.0],
-    labels=['Sangat Rendah', 'Rendah', 'Sedang', 'Tinggi', 'Sangat Tinggi']
-)
-
-# Rata-rata jumlah peminjaman berdasarkan kategori Windspeed
-grouped = collectByWindSpeed.groupby('windspeed_range', observed=False)['cnt'].mean()
-
-# Bar Plot: Rata-rata Peminjaman Berdasarkan Kategori Windspeed
-fig2, ax2 = plt.subplots(figsize=(8, 5))
-grouped.plot(kind='bar', ax=ax2, color='skyblue')
-ax2.set_title('Rata-rata Peminjaman Sepeda berdasarkan Windspeed')
-ax2.set_xlabel('Kategori Windspeed')
-ax2.set_ylabel('Rata-rata Jumlah Peminjaman Sepeda')
-ax2.set_xticklabels(grouped.index, rotation=45)
-ax2.grid(axis='y')
-fig2.tight_layout()  # Menghindari tampilan yang terpotong
-st.pyplot(fig2)
+windspeed_fine, windspeed_categories = panel_data['Windspeed']
+
+# Total peminjaman per bin windspeed selebar 0.02 (titik tengah bin), bukan per nilai float yang persis sama
+collectByWindSpeed = windspeed_fine[windspeed_fine['count'] > 0]
+collectByWindSpeed = collectByWindSpeed.assign(windspeed=collectByWindSpeed.index.mid).rename(columns={'sum': 'cnt'})
+
+def plot_windspeed(collectByWindSpeed):
+    fig1, ax1 = plt.subplots(figsize=(10, 6))
+    ax1.scatter(collectByWindSpeed['windspeed'], collectByWindSpeed['cnt'], alpha=0.5, color='orange')
+    ax1.set_title('Hubungan antara Windspeed dan Jumlah Peminjaman Sepeda')
+    ax1.set_xlabel('Kecepatan Angin (Windspeed)')
+    ax1.set_ylabel('Jumlah Peminjaman Sepeda (cnt)')
+    ax1.grid()
+    return fig1
+
+
+# Menampilkan plot pertama
+show_chart('windspeed', plot_windspeed, collectByWindSpeed[['windspeed', 'cnt']],
+           spec=scatter_spec('windspeed', 'cnt', title='Hubungan antara Windspeed dan Jumlah Peminjaman Sepeda',
+                             x_title='Kecepatan Angin (Windspeed)', y_title='Jumlah Peminjaman Sepeda (cnt)'))
+
+# Bar Plot: Rata-rata peminjaman per jam berdasarkan kategori windspeed, dengan selang kepercayaan 95%
+grouped = windspeed_categories.set_index('label')[['mean', 'ci_low', 'ci_high']].rename(columns={'mean': 'cnt'})
+grouped.index.name = 'windspeed_range'
+
+def plot_windspeed_range(grouped):
+    fig2, ax2 = plt.subplots(figsize=(8, 5))
+    error = [grouped['cnt'] - grouped['ci_low'], grouped['ci_high'] - grouped['cnt']]
+    ax2.bar(grouped.index, grouped['cnt'], yerr=error, capsize=4, color='skyblue')
+    ax2.set_title('Rata-rata Peminjaman Sepeda berdasarkan Windspeed')
+    ax2.set_xlabel('Kategori Windspeed')
+    ax2.set_ylabel('Rata-rata Peminjaman Sepeda per Jam')
+    ax2.set_xticks(range(len(grouped.index)), grouped.index, rotation=45)
+    ax2.grid(axis='y')
+    fig2.tight_layout()  # Menghindari tampilan yang terpotong
+    return fig2
+
+
+show_chart('windspeed_range', plot_windspeed_range, grouped,
+           spec=bar_spec('windspeed_range', 'cnt', sort=None, title='Rata-rata Peminjaman Sepeda berdasarkan Windspeed',
+                         x_title='Kategori Windspeed', y_title='Rata-rata Peminjaman Sepeda per Jam'),
+           spec_data=grouped.reset_index())
 
 with st.expander("Hasil Analisis Pengaruh Windspeed Terhadap Peminjaman Sepeda"):
-    st.write("""
-    Statistik deskriptif menunjukkan bahwa kolom windspeed memiliki nilai rata-rata tertentu dengan variasi data yang signifikan. Hal ini menunjukkan bahwa kecepatan angin bervariasi dari sangat rendah hingga tinggi dalam dataset.
-    1. Kecepatan angin (windspeed) memiliki hubungan negatif lemah dengan jumlah peminjaman sepeda. Angin kencang memang mengurangi jumlah peminjaman, tetapi tidak secara signifikan.
-    2. Pada kecepatan angin rendah, jumlah peminjaman lebih tinggi, sedangkan angin yang lebih kuat mengurangi aktivitas peminjaman.
+    category_lines = "\n".join(
+        f"    - **{row.label}**: rata-rata {row.mean:.1f} peminjaman per jam "
+        f"(CI 95%: {row.ci_low:.1f}–{row.ci_high:.1f}, {row.count:,} jam)"
+        for row in windspeed_categories.itertuples())
+    st.write(f"""
+    Rata-rata peminjaman dihitung per jam pada setiap kategori kecepatan angin, beserta selang kepercayaan 95%:
+{category_lines}
+
+    1. Perbedaan antar kategori windspeed relatif kecil dibandingkan variasi peminjaman per jam; selang kepercayaan menunjukkan seberapa pasti perbedaan tersebut.
+    2. Kategori dengan sedikit jam pengamatan (angin sangat kencang) memiliki selang yang lebih lebar, sehingga kesimpulannya kurang pasti.
     3. Meskipun windspeed memiliki dampak kecil, faktor lain seperti suhu (temp), kelembapan (hum), dan kondisi cuaca (weathersit) juga berperan dalam memengaruhi jumlah peminjaman sepeda.
     """)
 
-# Pertanyaan 3: Perbedaan Penyewaan Sepeda antara Hari Libur dan Hari Kerja
-st.header("Perbedaan Penyewaan Sepeda antara Hari Libur dan Hari Kerja")
+# Distribusi peminjaman per bin kuantil variabel cuaca; pilihan kolom hanya menjalankan ulang bagian ini
+@st.fragment
+def weather_distribution_section():
+    column = st.selectbox("Variabel cuaca", WEATHER_COLUMNS, key='distribution_column')
+    distribution = compute_weather_distribution(version, column)
+    table = distribution[['count', 'mean', 'ci_low', 'ci_high']].rename(columns={
+        'count': 'Jumlah Jam', 'mean': 'Rata-rata per Jam', 'ci_low': 'CI 95% Bawah', 'ci_high': 'CI 95% Atas'})
+    table.index = table.index.astype(str)
+    table.index.name = f'Rentang {column}'
+    st.dataframe(table.round(1), width='stretch')
 
-day_mapping = {
-    0: 'Senin',
-    1: 'Selasa',
-    2: 'Rabu',
-    3: 'Kamis',
-    4: 'Jumat',
-    5: 'Sabtu',
-    6: 'Minggu'
-}
 
-data_frame_ratio = day_data
-data_frame_ratio['holiday'] = data_frame_ratio.apply(
-    lambda row: 1 if row['weekday'] in [5, 6] else row['holiday'],
-    axis=1
-)
+st.subheader("Peminjaman per Kuantil Variabel Cuaca")
+weather_distribution_section()
 
-data_frame_ratio['weekday_name'] = data_frame_ratio['weekday'].map(day_mapping)
-data_frame_ratio['holiday_type'] = data_frame_ratio['holiday'].map({0: 'Hari Kerja', 1: 'Hari Libur'})
+# Pertanyaan 3: Perbedaan Penyewaan Sepeda antara Hari Libur dan Hari Kerja
+timer.mark("Hari libur")
+st.header("Perbedaan Penyewaan Sepeda antara Hari Libur dan Hari Kerja")
+avg_bike_rentals = panel_data['Hari libur']
 
-avg_bike_rentals = data_frame_ratio.groupby(['weekday_name', 'holiday_type'])['cnt'].mean().reset_index()
+def plot_holiday(avg_bike_rentals):
+    fig, ax = plt.subplots(figsize=(12, 6))
+    sns.barplot(x='weekday_name', y='cnt', hue='holiday_type', data=avg_bike_rentals, palette='viridis', ax=ax)
+    ax.set_title("Rata-Rata Penyewaan Sepeda Berdasarkan Hari")
+    ax.set_xlabel("Hari")
+    ax.set_ylabel("Rata-Rata Penyewaan Sepeda")
+    ax.legend(title="Jenis Hari", loc='upper right')
+    return fig
 
-order = ['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Minggu']
-avg_bike_rentals['weekday_name'] = pd.Categorical(avg_bike_rentals['weekday_name'], categories=order, ordered=True)
-avg_bike_rentals = avg_bike_rentals.sort_values('weekday_name')
 
-fig, ax = plt.subplots(figsize=(12, 6))
-sns.barplot(x='weekday_name', y='cnt', hue='holiday_type', data=avg_bike_rentals, palette='viridis')
-plt.title("Rata-Rata Penyewaan Sepeda Berdasarkan Hari")
-plt.xlabel("Hari")
-plt.ylabel("Rata-Rata Penyewaan Sepeda")
-plt.legend(title="Jenis Hari", loc='upper right')
-st.pyplot(fig)
+show_chart('holiday', plot_holiday, avg_bike_rentals,
+           spec=bar_spec('weekday_name', 'cnt', color='holiday_type', sort=order,
+                         title="Rata-Rata Penyewaan Sepeda Berdasarkan Hari",
+                         x_title="Hari", y_title="Rata-Rata Penyewaan Sepeda"))
 
 with st.expander("Hasil Analisis Rata Rata Penyewaan Sepeda Berdasarkan Hari Libur dan Kerja"):
     st.write("""
@@ -411,32 +646,41 @@ with st.expander("Hasil Analisis Rata Rata Penyewaan Sepeda Berdasarkan Hari Lib
     """)
 
 # Pertanyaan 4: Musim dengan Potensi Terbesar untuk Promosi Layanan Sepeda
+timer.mark("Musim")
 st.header("Musim dengan Potensi Terbesar untuk Promosi Layanan Sepeda")
+season_means = panel_data['Musim']
 
-season_mapping = {1: "Spring", 2: "Summer", 3: "Fall", 4: "Winter"}
-hour_data['season_name'] = hour_data['season'].map(season_mapping)
+season_avg_rentals = season_means['cnt']
+season_casual_registered = season_means[['casual', 'registered']]
 
-season_avg_rentals = hour_data.groupby('season_name')['cnt'].mean()
-season_casual_registered = hour_data.groupby('season_name')[['casual', 'registered']].mean()
-
-fig, ax = plt.subplots(1, 2, figsize=(14, 6))
-
-ax[0].bar(season_avg_rentals.index, season_avg_rentals.values, color=['#FF9999', '#66B2FF', '#99FF99', '#FFD700'])
-ax[0].set_title('Rata-Rata Penyewaan Sepeda per Musim')
-ax[0].set_ylabel('Rata-Rata Penyewaan')
-ax[0].set_xlabel('Musim')
-
-x_ticks = np.arange(len(season_casual_registered.index))
-ax[1].plot(x_ticks, season_casual_registered['casual'], label='Casual Users', marker='o', color='skyblue')
-ax[1].plot(x_ticks, season_casual_registered['registered'], label='Registered Users', marker='o', color='orange')
-ax[1].set_title('Casual vs Registered Users per Musim')
-ax[1].set_ylabel('Rata-Rata Penyewaan')
-ax[1].set_xlabel('Musim')
-ax[1].set_xticks(x_ticks)
-ax[1].set_xticklabels(season_casual_registered.index)
-ax[1].legend()
+def plot_seasons(season_avg_rentals, season_casual_registered):
+    fig, ax = plt.subplots(1, 2, figsize=(14, 6))
 
-st.pyplot(fig)
+    ax[0].bar(season_avg_rentals.index, season_avg_rentals.values, color=['#FF9999', '#66B2FF', '#99FF99', '#FFD700'])
+    ax[0].set_title('Rata-Rata Penyewaan Sepeda per Musim')
+    ax[0].set_ylabel('Rata-Rata Penyewaan')
+    ax[0].set_xlabel('Musim')
+
+    x_ticks = np.arange(len(season_casual_registered.index))
+    ax[1].plot(x_ticks, season_casual_registered['casual'], label='Casual Users', marker='o', color='skyblue')
+    ax[1].plot(x_ticks, season_casual_registered['registered'], label='Registered Users', marker='o', color='orange')
+    ax[1].set_title('Casual vs Registered Users per Musim')
+    ax[1].set_ylabel('Rata-Rata Penyewaan')
+    ax[1].set_xlabel('Musim')
+    ax[1].set_xticks(x_ticks)
+    ax[1].set_xticklabels(season_casual_registered.index)
+    ax[1].legend()
+    return fig
+
+
+show_chart('seasons', plot_seasons, season_avg_rentals, season_casual_registered,
+           spec=concat_spec(bar_spec('season_name', 'cnt', sort=None, title='Rata-Rata Penyewaan Sepeda per Musim',
+                                     x_title='Musim', y_title='Rata-Rata Penyewaan'),
+                            fold(line_spec('season_name', 'rata_rata', color='pengguna', x_kind='nominal',
+                                           title='Casual vs Registered Users per Musim',
+                                           x_title='Musim', y_title='Rata-Rata Penyewaan'),
+                                 ['casual', 'registered'], ('pengguna', 'rata_rata'))),
+           spec_data=season_means.reset_index())
 
 with st.expander("Hasil Analisis Rata-Rata Penyewaan Sepeda Permusim"):
     st.write("""
@@ -445,3 +689,18 @@ with st.expander("Hasil Analisis Rata-Rata Penyewaan Sepeda Permusim"):
     
     **Grafik Garis**: Perbandingan Pengguna Kasual vs Terdaftar per Musim
     Penjelasan: Grafik ini membandingkan rata-rata peminjaman oleh pengguna kasual dan terdaftar: Pengguna terdaftar mendominasi di semua musim. Pengguna kasual meningkat signifikan di musim panas dan musim gugur, menunjukkan peluang untuk promosi musiman yang lebih santai. Jawaban: Promosi dapat difokuskan pada pengguna kasual selama musim panas dan gugur karena segmen ini lebih responsif terhadap kondisi cuaca yang mendukung.""")
+
+timer.stop()
+metrics_path = timer.write_metrics(page='dashboard')
+if debug:
+    with st.sidebar.expander("Debug", expanded=True):
+        st.caption("Metrik per bagian (run ini)")
+        st.dataframe(timer.table(), hide_index=True)
+        stale = [table for table in TABLES if is_stale(table)]
+        shared = SHARED_CACHE.stats()
+        st.caption(f"Cache bersama: {shared['entries']} hasil, {shared['mb']:.1f}/{shared['budget_mb']:.0f} MB, "
+                   f"{shared['hits']} hit, {shared['misses']} miss, {shared['evictions']} diusir. "
+                   f"Cache gambar: {FIGURE_CACHE.hits} hit, {FIGURE_CACHE.misses} miss. "
+                   f"Cache .npy usang: {', '.join(stale) or 'tidak ada'}.")
+        if metrics_path:
+            st.caption(f"Metrik ditulis ke {metrics_path}")